@@ -0,0 +1,94 @@
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+
+class Overloaded(Exception):
+    """Raised when a call is shed instead of admitted"""
+
+    def __init__(self, message, retry_after=1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Cap concurrent calls to a slow dependency, with a bounded, deadline-limited wait queue
+
+    Callers beyond max_in_flight wait up to queue_timeout seconds for a slot.
+    When max_queue callers are already waiting, new ones are rejected at once.
+    """
+
+    def __init__(self, max_in_flight, max_queue, queue_timeout):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._cond = threading.Condition()
+        self.in_flight = 0
+        self.waiting = 0
+        self.peak_waiting = 0
+        self.admitted = 0
+        self.shed_queue_full = 0
+        self.shed_timeout = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.avg_service = 0.0  # moving average of seconds a slot is held
+
+    def retry_after(self):
+        return max(1, math.ceil(self.avg_service))
+
+    def acquire(self):
+        start = time.monotonic()
+        with self._cond:
+            if self.in_flight >= self.max_in_flight:
+                if self.waiting >= self.max_queue:
+                    self.shed_queue_full += 1
+                    raise Overloaded("LLM queue is full", self.retry_after())
+
+                self.waiting += 1
+                self.peak_waiting = max(self.peak_waiting, self.waiting)
+                try:
+                    deadline = start + self.queue_timeout
+                    while self.in_flight >= self.max_in_flight:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self.shed_timeout += 1
+                            raise Overloaded("Timed out waiting for an LLM slot", self.retry_after())
+                        self._cond.wait(remaining)
+                finally:
+                    self.waiting -= 1
+
+            self.in_flight += 1
+            self.admitted += 1
+            waited = time.monotonic() - start
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+        return time.monotonic()
+
+    def release(self, acquired_at):
+        held = time.monotonic() - acquired_at
+        with self._cond:
+            self.in_flight -= 1
+            self.avg_service = held if not self.avg_service else 0.8 * self.avg_service + 0.2 * held
+            self._cond.notify()
+
+    @contextmanager
+    def slot(self):
+        acquired_at = self.acquire()
+        try:
+            yield
+        finally:
+            self.release(acquired_at)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "in_flight": self.in_flight,
+                "queue_depth": self.waiting,
+                "peak_queue_depth": self.peak_waiting,
+                "admitted": self.admitted,
+                "shed_queue_full": self.shed_queue_full,
+                "shed_timeout": self.shed_timeout,
+                "avg_wait_ms": round(self.total_wait / self.admitted * 1000, 1) if self.admitted else None,
+                "max_wait_ms": round(self.max_wait * 1000, 1),
+            }
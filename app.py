@@ -1,48 +1,125 @@
-from flask import Flask, request, jsonify
-from sources import fetch_all_news_sources
+from flask import Flask, Response, request, jsonify, stream_with_context
+from sources import fetch_all_news_sources, source_timings, gnews_quota, GNEWS_DAILY_QUOTA
 from flask_cors import CORS
 import traceback
 import json
 import requests
+import http_client
+import llm
+from admission import Overloaded
+from cache import TTLCache, normalize_query
+from singleflight import SingleFlight
+from pagination import keyset_page, parse_limit, stream_json_array
+from write_behind import WriteBehindBuffer
+from article_store import ArticleStore
+from json_provider import FastJSONProvider
+from http_caching import cached_json_response
+from news_feed import ArticleFeed
+from urls import clean_url, url_hash
+from ranking import rank_articles
+from search_index import SearchIndex
+from news_stream import Broadcaster
+from ingest import IngestJob, IngestWorker
 import os
 import uuid
-from db import users_collection, chat_collection, search_logs
+import threading
+import time
+import hashlib
+from db import users_collection, chat_collection, search_logs, articles_collection, ensure_indexes
 import traceback
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 import json
-import bcrypt
+from passwords import PasswordServiceBusy, hash_password, verify_password, rehash_if_needed, pool_stats
 import jwt
 
 # Load environment variables
 load_dotenv()
 
 app = Flask(__name__)
+# orjson-backed when available; serialises ObjectId and datetime natively
+app.json = FastJSONProvider(app)
 # Configure CORS for all routes
-CORS(app, origins=["http://localhost:3000"], supports_credentials=True)
+CORS(app, origins=["http://localhost:3000"], supports_credentials=True, expose_headers=["X-Next-Cursor"])
 
 # API keys
 GNEWS_API_KEY = os.getenv("GNEWS_API_KEY")
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+GNEWS_API_BASE = os.getenv("GNEWS_API_BASE", "https://gnews.io/api/v4")
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-for-jwt-generation")
 JWT_EXPIRATION = 24  # hours
+NEWSBOT_CONTEXT_ITEMS = int(os.getenv("NEWSBOT_CONTEXT_ITEMS", "8"))  # articles summarised for the LLM
 
 if not GNEWS_API_KEY:
     raise ValueError("GNEWS_API_KEY is missing in .env")
 if not GROQ_API_KEY:
     raise ValueError("GROQ_API_KEY is missing in .env")
 
-# Constants
-GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
-HEADERS = {
-    "Authorization": f"Bearer {GROQ_API_KEY}",
-    "Content-Type": "application/json"
-}
+# Cache
+NEWS_CACHE_TTL = int(os.getenv("NEWS_CACHE_TTL", "1800"))  # seconds
+NEWS_CACHE_SIZE = int(os.getenv("NEWS_CACHE_SIZE", "256"))  # distinct queries
+NEWS_CACHE_MAX_BYTES = int(os.getenv("NEWS_CACHE_MAX_BYTES", str(8 * 1024 * 1024)))
+NEWS_STALE_TTL = int(os.getenv("NEWS_STALE_TTL", "21600"))  # serve stale news this long past the TTL
+NEWS_ERROR_TTL = int(os.getenv("NEWS_ERROR_TTL", "60"))  # back off from a failing query this long
+NEWS_FEED_MAX_ITEMS = int(os.getenv("NEWS_FEED_MAX_ITEMS", "500"))  # articles remembered per query for ?since=
+NEWS_STREAM_INTERVAL = int(os.getenv("NEWS_STREAM_INTERVAL", "60"))  # minimum seconds between on-demand stream refreshes
+NEWS_STREAM_KEEPALIVE = int(os.getenv("NEWS_STREAM_KEEPALIVE", "15"))  # seconds between SSE keepalive comments
+NEWS_STREAM_MAX_TOPICS = int(os.getenv("NEWS_STREAM_MAX_TOPICS", "32"))  # distinct categories streamed at once
+
+# GNews quota (sources.gnews_quota) is shared by user-facing fetches, /ask_newsbot and background refreshes
+# Background ingestion of headlines and CATEGORIES feeds; set INGEST_WORKER=0 to disable
+INGEST_WORKER = os.getenv("INGEST_WORKER", "1") == "1"
+INGEST_QUOTA_SHARE = float(os.getenv("INGEST_QUOTA_SHARE", "0.6"))  # rest of the daily quota is kept for cache misses
+INGEST_MIN_INTERVAL = int(os.getenv("INGEST_MIN_INTERVAL", "600"))  # seconds between refreshes of one feed, at least
+INGEST_JITTER = float(os.getenv("INGEST_JITTER", "0.1"))
+INGEST_RESERVE = GNEWS_DAILY_QUOTA - int(GNEWS_DAILY_QUOTA * INGEST_QUOTA_SHARE)
+# Slice of the background share for streamed topics the ingest worker doesn't cover
+NEWS_STREAM_QUOTA_SHARE = float(os.getenv("NEWS_STREAM_QUOTA_SHARE", "0.1"))
+NEWS_STREAM_BUDGET = int(GNEWS_DAILY_QUOTA * NEWS_STREAM_QUOTA_SHARE)  # calls per day
+
+# Local search over every article fetched so far; /get_news?query= tries it before GNews
+SEARCH_INDEX_PATH = os.getenv("SEARCH_INDEX_PATH", "articles.sqlite3")
+SEARCH_RETENTION = int(os.getenv("SEARCH_RETENTION", str(7 * 86400)))  # seconds articles stay searchable
+SEARCH_MIN_RESULTS = int(os.getenv("SEARCH_MIN_RESULTS", "5"))  # fewer local matches fall back to GNews
+SEARCH_MAX_AGE = int(os.getenv("SEARCH_MAX_AGE", "21600"))  # ...as does having no match published this recently
+SEARCH_LOCAL_TTL = int(os.getenv("SEARCH_LOCAL_TTL", "300"))  # seconds a local answer is cached
+search_index = None  # opened by init_app()
 
-# Session and cache
-session = requests.Session()
 summary_cache = {}
-news_cache = {"data": None, "timestamp": datetime.utcnow()}
+# Keyed by normalize_query(query); "" holds the top headlines
+news_cache = TTLCache(maxsize=NEWS_CACHE_SIZE, ttl=NEWS_CACHE_TTL, max_bytes=NEWS_CACHE_MAX_BYTES,
+                      stale_ttl=NEWS_STALE_TTL)
+# Negative cache of upstream failures, same keys
+news_errors = TTLCache(maxsize=NEWS_CACHE_SIZE, ttl=NEWS_ERROR_TTL)
+# Ingestion-ordered article index per cache key, for /get_news?since=
+news_feeds = TTLCache(maxsize=NEWS_CACHE_SIZE, ttl=NEWS_CACHE_TTL + NEWS_STALE_TTL)
+_news_feeds_lock = threading.Lock()
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+# Chat and search-log inserts are acknowledged immediately and flushed in batches
+WRITE_BEHIND_BATCH = int(os.getenv("WRITE_BEHIND_BATCH", "100"))
+WRITE_BEHIND_INTERVAL = float(os.getenv("WRITE_BEHIND_INTERVAL", "0.5"))  # seconds
+WRITE_BEHIND_MAX_PENDING = int(os.getenv("WRITE_BEHIND_MAX_PENDING", "10000"))
+# Writers are started by init_app()
+chat_writer = None
+search_log_writer = None
+# Every fetched article, upserted by canonical URL into the durable articles collection
+article_store = None
+
+# Verified JWT payloads by token digest, each kept no longer than its exp
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+TOKEN_CACHE_TTL = int(os.getenv("TOKEN_CACHE_TTL", "300"))  # seconds
+token_cache = TTLCache(maxsize=TOKEN_CACHE_SIZE, ttl=TOKEN_CACHE_TTL)
+
+# User documents (without password) by email; USER_CACHE_TTL=0 disables
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", "30"))  # seconds
+user_cache = TTLCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL)
+
+# Concurrent identical upstream fetches share one request
+news_flight = SingleFlight()
+sources_flight = SingleFlight()
 
 CATEGORIES = {
     "sports": ["football", "cricket", "basketball", "tennis", "hockey"],
@@ -52,6 +129,34 @@ CATEGORIES = {
     "entertainment": ["movies", "music", "celebrity", "tv"]
 }
 
+@app.errorhandler(Overloaded)
+@app.errorhandler(PasswordServiceBusy)
+def handle_overloaded(e):
+    response = jsonify({"error": "Service busy", "message": str(e)})
+    response.status_code = 503
+    response.headers["Retry-After"] = str(e.retry_after)
+    return response
+
+def verify_token(token):
+    """Decode and verify a JWT, reusing the result for repeat presentations of the same token"""
+    token_key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+    payload = token_cache.get(token_key)
+    if payload is None:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
+        ttl = min(TOKEN_CACHE_TTL, payload["exp"] - time.time()) if "exp" in payload else TOKEN_CACHE_TTL
+        if ttl > 0:
+            token_cache.set(token_key, payload, ttl=ttl)
+    return dict(payload)
+
+def get_cached_user(email):
+    """User document without the password hash, served from user_cache when fresh"""
+    user = user_cache.get(email) if USER_CACHE_TTL > 0 else None
+    if user is None:
+        user = users_collection.find_one({"email": email}, {"password": 0})
+        if user is not None and USER_CACHE_TTL > 0:
+            user_cache.set(email, user)
+    return user
+
 # Authentication middleware
 def token_required(f):
     def decorated(*args, **kwargs):
@@ -65,8 +170,7 @@ def token_required(f):
             return jsonify({'error': 'Authentication token is missing'}), 401
             
         try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
-            request.user = payload
+            request.user = verify_token(token)
         except jwt.ExpiredSignatureError:
             return jsonify({'error': 'Token has expired'}), 401
         except jwt.InvalidTokenError:
@@ -93,7 +197,7 @@ def register_user():
             return jsonify({"error": "User already exists"}), 409
         
         # Hash the password before storing
-        hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+        hashed_password = hash_password(password)
         
         new_user = {
             "email": email,
@@ -130,6 +234,8 @@ def register_user():
             "token": token
         }), 201
         
+    except PasswordServiceBusy:
+        raise
     except Exception as e:
         print(f"Registration error: {str(e)}")
         print(traceback.format_exc())
@@ -150,7 +256,19 @@ def login_or_signup_user():
 
         # Case 1: User exists → Try logging in
         if user:
-            if bcrypt.checkpw(password.encode('utf-8'), user["password"]):
+            if verify_password(password, user["password"]):
+                # Upgrade hashes made with an older work factor; best-effort, the login already succeeded
+                try:
+                    new_hash = rehash_if_needed(password, user["password"])
+                except PasswordServiceBusy:
+                    print(f"[WARN] Password rehash for {email} skipped: hashing pool busy")
+                    new_hash = None
+                if new_hash:
+                    try:
+                        users_collection.update_one({"_id": user["_id"]}, {"$set": {"password": new_hash}})
+                    except Exception as e:
+                        print(f"Password rehash for {email} not saved: {e}")
+
                 user_to_return = {
                     "_id": str(user["_id"]),
                     "email": user["email"],
@@ -177,7 +295,7 @@ def login_or_signup_user():
                 return jsonify({"error": "Invalid password"}), 401
 
         # Case 2: User doesn't exist → Register new user
-        hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+        hashed_password = hash_password(password)
         new_user = {
             "email": email,
             "name": name,
@@ -211,6 +329,8 @@ def login_or_signup_user():
             "token": token
         }), 201
 
+    except PasswordServiceBusy:
+        raise
     except Exception as e:
         print(traceback.format_exc())
         return jsonify({"error": f"Login/Signup failed: {str(e)}"}), 500
@@ -222,15 +342,15 @@ def get_user():
     email = request.user["email"]  # Get email from JWT token
     
     try:
-        user = users_collection.find_one({"email": email})
+        user = get_cached_user(email)
         if user:
             # Return user without password
             user_to_return = {
-                "_id": str(user["_id"]),
+                "_id": user["_id"],
                 "email": user["email"],
                 "name": user["name"],
                 "preferences": user.get("preferences", []),
-                "created_at": user.get("created_at").isoformat() if user.get("created_at") else None
+                "created_at": user.get("created_at")
             }
             return jsonify(user_to_return), 200
         return jsonify({"error": "User not found"}), 404
@@ -254,6 +374,7 @@ def update_preferences():
             {"$set": {"preferences": preferences}}
         )
         
+        user_cache.pop(email)
         if result.matched_count:
             return jsonify({"message": "Preferences updated"}), 200
         return jsonify({"error": "User not found"}), 404
@@ -282,13 +403,27 @@ def save_chat():
             "answer": answer,
             "timestamp": datetime.utcnow()
         }
-        chat_collection.insert_one(chat_doc)
+        chat_writer.add(chat_doc)
         return jsonify({"message": "Chat saved", "session_id": session_id}), 201
         
     except Exception as e:
         print(traceback.format_exc())
         return jsonify({"error": "Failed to save chat"}), 500
 
+def history_page(collection, query, projection, newest_first):
+    """Keyset-paginated JSON array; X-Next-Cursor carries the cursor for the next page"""
+    try:
+        limit = parse_limit(request.args.get("limit"))
+        docs, next_cursor = keyset_page(collection, query, projection, newest_first, limit,
+                                        before=request.args.get("before"), after=request.args.get("after"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    response = Response(stream_json_array(docs, app.json.dumps), mimetype="application/json")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return response
+
 @app.route("/chat_history", methods=["GET"])
 @token_required
 def chat_history():
@@ -299,14 +434,10 @@ def chat_history():
         query = {"email": email}
         if session_id:
             query["session_id"] = session_id
-            
-        chats = list(chat_collection.find(query).sort("timestamp", 1))
-        for chat in chats:
-            chat["_id"] = str(chat["_id"])
-            if isinstance(chat.get("timestamp"), datetime):
-                chat["timestamp"] = chat["timestamp"].isoformat()
-                
-        return jsonify(chats), 200
+
+        # Newest entries, oldest first; page back with ?before=<X-Next-Cursor>
+        projection = {"session_id": 1, "question": 1, "answer": 1, "timestamp": 1}
+        return history_page(chat_collection, query, projection, newest_first=False)
         
     except Exception as e:
         print(traceback.format_exc())
@@ -328,7 +459,7 @@ def log_search():
             "query": query,
             "timestamp": datetime.utcnow()
         }
-        search_logs.insert_one(log_entry)
+        search_log_writer.add(log_entry)
         return jsonify({"message": "Search logged"}), 201
         
     except Exception as e:
@@ -341,61 +472,261 @@ def get_search_history():
     email = request.user["email"]  # Get email from JWT token
     
     try:
-        history = list(search_logs.find({"email": email}).sort("timestamp", -1))
-        for entry in history:
-            entry["_id"] = str(entry["_id"])
-            if isinstance(entry.get("timestamp"), datetime):
-                entry["timestamp"] = entry["timestamp"].isoformat()
-                
-        return jsonify(history), 200
+        # Newest first; page back with ?before=<X-Next-Cursor>
+        projection = {"query": 1, "timestamp": 1}
+        return history_page(search_logs, {"email": email}, projection, newest_first=True)
         
     except Exception as e:
         print(traceback.format_exc())
         return jsonify({"error": "Failed to fetch search history"}), 500
 
-def fetch_news(query=None):
-    try:
-        if not query and news_cache["data"] and datetime.utcnow() - news_cache["timestamp"] < timedelta(minutes=30):
-            print("Serving cached news")
-            return news_cache["data"]
-
-        base_url = "https://gnews.io/api/v4/search" if query else "https://gnews.io/api/v4/top-headlines"
-        params = {
-            "q": query or "",
-            "lang": "en",
-            "country": "in",
-            "token": GNEWS_API_KEY,
-            "sortby": "publishedAt"
-        }
+def _fetch_gnews(query, cache_key, ttl=None):
+    base_url = f"{GNEWS_API_BASE}/search" if query else f"{GNEWS_API_BASE}/top-headlines"
+    params = {
+        "q": query or "",
+        "lang": "en",
+        "country": "in",
+        "token": GNEWS_API_KEY,
+        "sortby": "publishedAt"
+    }
 
-        response = session.get(base_url, params=params)
+    gnews_quota.spend()
+    try:
+        response = http_client.get(base_url, params=params)
         response.raise_for_status()
         articles = response.json().get("articles", [])
+    except requests.exceptions.RequestException as e:
+        news_errors.set(cache_key, str(e))
+        raise
 
-        news_list = [{
+    # One entry per canonical URL; GNews repeats syndicated articles under tracking variants
+    news_list = []
+    seen_urls = set()
+    for a in articles:
+        url = clean_url(a.get("url", "#"))
+        if url.startswith("http"):
+            key = url_hash(url)
+            if key in seen_urls:
+                continue
+            seen_urls.add(key)
+        news_list.append({
             "title": a.get("title", "No Title"),
             "description": a.get("description", "No Description"),
-            "url": a.get("url", "#"),
+            "url": url,
             "image": a.get("image", "https://via.placeholder.com/150"),
             "published_at": a.get("publishedAt", "Unknown Date")
-        } for a in articles[:10]]
+        })
+        if len(news_list) == 10:
+            break
 
-        if not query:
-            news_cache["data"] = news_list
-            news_cache["timestamp"] = datetime.utcnow()
+    news_cache.set(cache_key, news_list, ttl=ttl)
+    news_errors.pop(cache_key)
+    index_news(cache_key, news_list)
+    search_index.add(news_list)
+    article_store.add_articles(news_list, source_name="GNews")
+    return news_list
+
+def _load_news(query, cache_key):
+    """Answer a search from the local index when it has enough fresh matches, else from GNews"""
+    if cache_key:
+        local = search_index.search(query, limit=10, min_results=SEARCH_MIN_RESULTS, max_age=SEARCH_MAX_AGE)
+        if local:
+            print(f"Answered '{cache_key}' from the local search index")
+            news_cache.set(cache_key, local, ttl=SEARCH_LOCAL_TTL)
+            index_news(cache_key, local)
+            return local
+    return _fetch_gnews(query, cache_key)
 
-        return news_list
+def index_news(cache_key, news_list):
+    """Add articles to the query's delta feed; returns the ones it hadn't seen"""
+    with _news_feeds_lock:
+        feed = news_feeds.get(cache_key)
+        if feed is None:
+            feed = ArticleFeed(max_items=NEWS_FEED_MAX_ITEMS)
+        # Re-set on every ingest so feeds live as long as their query is in use
+        news_feeds.set(cache_key, feed)
+    added = feed.add(news_list)
+    if added:
+        news_broadcaster.publish(cache_key)
+    return added
 
+def _refresh_news(query, cache_key):
+    try:
+        news_flight.do(cache_key, _load_news, query, cache_key)
+        print(f"Refreshed stale news for '{cache_key}'")
+    except requests.exceptions.RequestException as e:
+        print(f"Background refresh failed for '{cache_key}', keeping stale news: {e}")
+    finally:
+        with _refreshing_lock:
+            _refreshing.discard(cache_key)
+
+def _refresh_in_background(query, cache_key):
+    # One refresh per key at a time, and none while the key is negatively cached
+    if cache_key in news_errors:
+        return
+    with _refreshing_lock:
+        if cache_key in _refreshing:
+            return
+        _refreshing.add(cache_key)
+    threading.Thread(target=_refresh_news, args=(query, cache_key), daemon=True).start()
+
+def fetch_news(query=None):
+    cache_key = normalize_query(query)
+    cached, is_stale = news_cache.get_stale(cache_key)
+    if cached is not None:
+        if is_stale:
+            print(f"Serving stale news for '{cache_key}'")
+            _refresh_in_background(query, cache_key)
+        else:
+            print(f"Serving cached news for '{cache_key}'")
+        if cache_key not in news_feeds:
+            # Feed was evicted while the articles stayed cached
+            index_news(cache_key, cached)
+        return cached
+
+    if cache_key in news_errors:
+        print(f"Upstream recently failed for '{cache_key}', not retrying yet")
+        return [{"title": "Error", "description": "Could not fetch news.", "url": "#"}]
+
+    try:
+        return news_flight.do(cache_key, _load_news, query, cache_key)
     except requests.exceptions.RequestException as e:
         print(f"Error fetching news: {e}")
-        news_cache["data"] = []
         return [{"title": "Error", "description": "Could not fetch news.", "url": "#"}]
 
 @app.route("/get_news", methods=["GET"])
 def get_news():
     query = request.args.get("query", "").strip()
     news = fetch_news(query)
-    return jsonify(news)
+    cache_key = normalize_query(query)
+
+    # Delta mode: only articles ingested after the client's cursor, plus the next cursor.
+    # An empty or unrecognised cursor (e.g. from before a restart) returns everything.
+    since = request.args.get("since")
+    if since is not None:
+        feed = news_feeds.get(cache_key)
+        if feed is None:
+            return jsonify({"articles": news, "cursor": None})
+        articles, cursor = feed.since(since)
+        return jsonify({"articles": articles, "cursor": cursor})
+
+    # ETag/304 and compression; max-age follows the news_cache entry's remaining TTL
+    return cached_json_response(cache_key, news, news_cache.ttl_remaining(cache_key))
+
+def _refresh_stream_topic(topic):
+    """Fetch a streamed topic once its cached news has expired, unless the ingest worker keeps it fresh"""
+    if ingest_worker.covers(topic) or topic in news_cache or topic in news_errors:
+        return False
+    if not gnews_quota.available(INGEST_RESERVE):
+        return False
+    news_flight.do(topic, _fetch_gnews, topic, topic)
+    return True
+
+# Live news over SSE, fanned out to all open streams. Streams are woken by index_news; the
+# refresher only covers uncached topics, one call per tick, within NEWS_STREAM_BUDGET a day.
+news_broadcaster = Broadcaster(_refresh_stream_topic,
+                               interval=max(NEWS_STREAM_INTERVAL, 86400 / NEWS_STREAM_BUDGET) if NEWS_STREAM_BUDGET else None,
+                               max_topics=NEWS_STREAM_MAX_TOPICS)
+
+def ingest_jobs():
+    """Headlines, each CATEGORIES name and each of its keywords, weighted in that order"""
+    jobs = {"": IngestJob("", None, weight=4)}
+    for category, keywords in CATEGORIES.items():
+        for query, weight in [(category, 2)] + [(keyword, 1) for keyword in keywords]:
+            cache_key = normalize_query(query)
+            if cache_key not in jobs:
+                jobs[cache_key] = IngestJob(cache_key, query, weight)
+    return list(jobs.values())
+
+def _ingest_refresh(query, cache_key, ttl):
+    news_flight.do(cache_key, _fetch_gnews, query, cache_key, ttl)
+
+# Keeps the headline and category feeds fresh so user requests are cache hits
+ingest_worker = IngestWorker(ingest_jobs(), _ingest_refresh, gnews_quota,
+                             daily_budget=GNEWS_DAILY_QUOTA - INGEST_RESERVE - NEWS_STREAM_BUDGET,
+                             min_interval=INGEST_MIN_INTERVAL, jitter=INGEST_JITTER, reserve=INGEST_RESERVE)
+
+def init_app():
+    """Open the stores and start background work for a serving process
+
+    Everything with side effects (MongoDB index provisioning, SQLite files,
+    writer and ingest threads) happens here rather than at import.
+    """
+    global search_index, chat_writer, search_log_writer, article_store
+    # Create/verify MongoDB indexes at startup (idempotent); set MONGO_ENSURE_INDEXES=0 to skip
+    if os.getenv("MONGO_ENSURE_INDEXES", "1") == "1":
+        ensure_indexes()
+    llm.init_cache()
+    search_index = SearchIndex(SEARCH_INDEX_PATH, retention=SEARCH_RETENTION)
+    chat_writer = WriteBehindBuffer(chat_collection, WRITE_BEHIND_BATCH, WRITE_BEHIND_INTERVAL, WRITE_BEHIND_MAX_PENDING)
+    search_log_writer = WriteBehindBuffer(search_logs, WRITE_BEHIND_BATCH, WRITE_BEHIND_INTERVAL, WRITE_BEHIND_MAX_PENDING)
+    article_store = ArticleStore(articles_collection, WRITE_BEHIND_BATCH, WRITE_BEHIND_INTERVAL, WRITE_BEHIND_MAX_PENDING)
+    # Under the debug reloader only the serving child process runs it
+    if INGEST_WORKER and (__name__ != "__main__" or os.environ.get("WERKZEUG_RUN_MAIN") == "true"):
+        ingest_worker.start()
+
+
+def news_events(subscription, cursor):
+    """Yield an SSE "articles" event per batch of new articles, with keepalives in between"""
+    first = True
+    try:
+        while True:
+            feed = news_feeds.get(subscription.topic)
+            if feed is not None:
+                articles, cursor = feed.since(cursor)
+                if articles or first:
+                    yield sse_event("articles", {"articles": articles, "cursor": cursor}, event_id=cursor)
+                    first = False
+            if not subscription.wait(NEWS_STREAM_KEEPALIVE):
+                yield ": keepalive\n\n"
+    finally:
+        news_broadcaster.unsubscribe(subscription)
+
+@app.route("/news_stream", methods=["GET"])
+def news_stream():
+    # category is the same query string /get_news takes; empty streams the top headlines.
+    # Reconnecting EventSources resume from Last-Event-ID, which is a feed cursor; without
+    # either that or ?since= the stream starts now, as the client already has /get_news's list.
+    query = request.args.get("category", "").strip()
+    cursor = request.headers.get("Last-Event-ID") or request.args.get("since")
+    topic = normalize_query(query)
+    if topic not in news_feeds:
+        fetch_news(query)
+    if cursor is None:
+        feed = news_feeds.get(topic)
+        cursor = feed.cursor() if feed is not None else ""
+    subscription = news_broadcaster.subscribe(topic)
+    response = sse_response(news_events(subscription, cursor))
+    # Also covers clients that disconnect before the generator first runs
+    response.call_on_close(lambda: news_broadcaster.unsubscribe(subscription))
+    return response
+
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    return jsonify({
+        "sources": source_timings,
+        "news_cache": news_cache.stats(),
+        "news_errors": news_errors.stats(),
+        "news_feeds": news_feeds.stats(),
+        "news_stream": news_broadcaster.stats(),
+        "search_index": search_index.stats(),
+        "ingest": ingest_worker.stats(),
+        "singleflight": {
+            "news": news_flight.stats(),
+            "sources": sources_flight.stats(),
+            "llm": llm.llm_flight.stats()
+        },
+        "llm_cache": llm.llm_cache.stats(),
+        "llm_admission": llm.admission.stats(),
+        "password_pool": pool_stats(),
+        "token_cache": token_cache.stats(),
+        "user_cache": user_cache.stats(),
+        "write_behind": {
+            "chats": chat_writer.stats(),
+            "search_logs": search_log_writer.stats(),
+            "articles": article_store.stats()
+        }
+    })
 
 @app.route("/process_input", methods=["POST"])
 def process_input():
@@ -482,17 +813,8 @@ def generate_timeline():
         
         # Make the API call to Groq
         try:
-            response = requests.post(GROQ_API_URL, headers=HEADERS, json=payload)
-            
-            # Debug info
-            print(f"Groq API response status: {response.status_code}")
-            if response.status_code != 200:
-                print(f"Groq API error: {response.text}")
-                
-            response.raise_for_status()
-            
-            # Parse the LLM response
-            raw_output = response.json()["choices"][0]["message"]["content"]
+            # Cached answers expire together with the articles they were built from
+            raw_output = llm.complete(payload, ttl=news_cache.ttl_remaining(normalize_query(topic)))
             print(f"Received raw output from Groq (length: {len(raw_output)})")
             
             # Extract the JSON part if it's embedded in other text
@@ -526,11 +848,15 @@ def generate_timeline():
                 "timeline": fallback_timeline,
                 "message": "Used simplified timeline due to processing error"
             })
+        except Overloaded:
+            raise
         except Exception as e:
             print(f"Timeline processing error: {e}")
             traceback.print_exc()
             return jsonify({"error": "Error processing timeline data", "message": str(e)}), 500
 
+    except Overloaded:
+        raise
     except Exception as e:
         print(f"Unhandled exception in generate_timeline: {e}")
         traceback.print_exc()
@@ -575,14 +901,9 @@ def generate_fallback_timeline(articles):
     
     return timeline
 
-def ask_groq_llm(prompt):
-    headers = {
-        "Authorization": f"Bearer {GROQ_API_KEY}",
-        "Content-Type": "application/json"
-    }
-    
+def newsbot_payload(prompt):
     # Use a model that's definitely available on Groq
-    payload = {
+    return {
         "model": "llama3-8b-8192",  # Changed from mixtral-8x7b-32768 which might be causing issues
         "messages": [
             {"role": "system", "content": "You are NewsBot, an expert in summarizing current events clearly and completely."},
@@ -591,23 +912,42 @@ def ask_groq_llm(prompt):
         "temperature": 0.7,
         "max_tokens": 1000
     }
-    
+
+def ask_groq_llm(prompt):
+    payload = newsbot_payload(prompt)
     try:
         print(f"Sending request to Groq API with payload: {json.dumps(payload)}")
-        response = requests.post("https://api.groq.com/openai/v1/chat/completions", json=payload, headers=headers)
-        
-        # Additional debug info
-        print(f"Groq API Status Code: {response.status_code}")
-        if response.status_code != 200:
-            print(f"Groq API Error Response: {response.text}")
-            
-        response.raise_for_status()
-        return response.json()["choices"][0]["message"]["content"]
+        return llm.complete(payload)
+    except Overloaded:
+        raise
     except Exception as e:
         print(f"[Groq LLM Error Details]: {e}")
-        print(f"Response content: {getattr(response, 'text', 'No response content')}")
         return f"I encountered an issue while processing your request. Error: {str(e)}"
-    
+
+def sse_event(event, data, event_id=None):
+    prefix = f"id: {event_id}\n" if event_id else ""
+    return f"{prefix}event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def stream_groq_llm(deltas):
+    """Yield an SSE "delta" event per streamed chunk, then a "done" or "error" event"""
+    try:
+        for delta in deltas:
+            yield sse_event("delta", {"text": delta})
+        yield sse_event("done", {})
+    except Exception as e:
+        print(f"[Groq LLM Stream Error]: {e}")
+        yield sse_event("error", {"message": f"I encountered an issue while processing your request. Error: {str(e)}"})
+    finally:
+        if hasattr(deltas, "close"):
+            deltas.close()
+
+def sse_response(events):
+    return Response(stream_with_context(events), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+def wants_stream(data):
+    return bool(data.get("stream")) or "text/event-stream" in request.headers.get("Accept", "")
+
 @app.route("/ask_newsbot", methods=["POST", "OPTIONS"])
 @token_required
 def ask_newsbot():
@@ -629,20 +969,28 @@ def ask_newsbot():
         
         # Step 1: Aggregate news from all sources
         try:
-            news_data = fetch_all_news_sources(query)
+            news_data = sources_flight.do(normalize_query(query), fetch_all_news_sources, query)
             print(f"Fetched {len(news_data)} news items")
         except Exception as e:
             print(f"Error fetching news sources: {e}")
             traceback.print_exc()
             return jsonify({"error": "News source error", "message": str(e)}), 500
             
+        # Dated items only; "on this day" events would surface in searches for current news
+        dated = [item for item in news_data if item.get("published_at")]
+        search_index.add(dated)
+        article_store.add_articles(dated)
+
         if not news_data:
             # If no news data, return a simple response rather than an error
-            return jsonify({"answer": f"Sorry, I couldn't find any recent news about '{query}'. Try a different topic or check back later."})
+            answer = f"Sorry, I couldn't find any recent news about '{query}'. Try a different topic or check back later."
+            if wants_stream(data):
+                return sse_response(iter([sse_event("delta", {"text": answer}), sse_event("done", {})]))
+            return jsonify({"answer": answer})
 
-        # Step 2: Summarize top articles
+        # Step 2: Summarize the articles most relevant to the query (BM25 with recency decay)
         summaries = []
-        for item in news_data[:8]:
+        for item in rank_articles(news_data, query, limit=NEWSBOT_CONTEXT_ITEMS):
             title = item.get("title", "").strip()
             desc = item.get("description", "").strip()
             content = item.get("content", "").strip()
@@ -661,11 +1009,17 @@ def ask_newsbot():
             "Explain it in a way that's easy to understand even for someone new to the topic."
         )
 
-        # Step 4: Ask Groq LLM
+        # Step 4: Ask Groq LLM, streaming the answer if the client opted in
+        if wants_stream(data):
+            # llm.stream() is admitted up front, so shedding still returns a plain 503
+            return sse_response(stream_groq_llm(llm.stream(newsbot_payload(prompt))))
+
         try:
             final_answer = ask_groq_llm(prompt)
             print(f"Received answer from Groq (length: {len(final_answer)} characters)")
             return jsonify({"answer": final_answer})
+        except Overloaded:
+            raise
         except Exception as e:
             print(f"Error from Groq LLM: {e}")
             traceback.print_exc()
@@ -675,6 +1029,8 @@ def ask_newsbot():
                 "answer": f"I'm having trouble processing your request about '{query}'. Technical issues are preventing me from generating a proper response right now."
             })
 
+    except Overloaded:
+        raise
     except Exception as e:
         print(f"Unhandled exception in ask_newsbot: {e}")
         traceback.print_exc()
@@ -694,12 +1050,17 @@ def chat_completion(prompt):
         ]
     }
     try:
-        res = requests.post(GROQ_API_URL, headers=HEADERS, json=payload)
-        res.raise_for_status()
-        return res.json()["choices"][0]["message"]["content"]
+        return llm.complete(payload)
+    except Overloaded:
+        raise
     except Exception as e:
         print(f"[Groq Chat Completion Error]: {e}")
         return "I'm sorry, I couldn't process your request."
 
+# The password pool's worker processes re-import a script run as __main__ under the name
+# __mp_main__; they only need its functions, never the serving state
+if __name__ != "__mp_main__":
+    init_app()
+
 if __name__ == "__main__":
     app.run(debug=True, port=5000)
\ No newline at end of file
@@ -0,0 +1,63 @@
+from datetime import datetime, timezone
+from pymongo import UpdateOne
+from ranking import parse_published
+from urls import canonicalize_url
+from write_behind import WriteBehindBuffer
+
+
+def article_document(item, source_name=None):
+    """Upsert payload for the articles collection, or None for items without a real URL"""
+    url = item.get("url") or ""
+    if not url.startswith("http") or not item.get("title"):
+        return None
+    sources = item.get("sources") or ([{"name": source_name, "url": url}] if source_name else [])
+    return {
+        "canonical_url": canonicalize_url(url),
+        "url": url,
+        "title": item["title"],
+        "description": item.get("description") or "",
+        "image": item.get("image"),
+        "published_at": parse_published(item.get("published_at")),
+        "sources": sources,
+    }
+
+
+class ArticleStore(WriteBehindBuffer):
+    """Write-behind upserts into the articles collection, keyed by canonical URL
+
+    Batches go out as one unordered bulk_write of UpdateOne upserts. Each
+    sighting refreshes the article's fields and ingested_at, which the TTL
+    index expires on, and adds any new source attributions.
+    """
+
+    def add_articles(self, items, source_name=None):
+        for item in items:
+            doc = article_document(item, source_name)
+            if doc:
+                self.add(doc)
+
+    def _apply(self, batch):
+        # One upsert per canonical URL; two for the same key in one unordered batch could race on the unique index
+        latest = {}
+        for doc in batch:
+            previous = latest.get(doc["canonical_url"])
+            if previous:
+                doc = {**doc, "sources": previous["sources"] + [s for s in doc["sources"] if s not in previous["sources"]]}
+            latest[doc["canonical_url"]] = doc
+
+        now = datetime.now(timezone.utc)
+        operations = []
+        for canonical_url, doc in latest.items():
+            fields = {k: v for k, v in doc.items() if k not in ("canonical_url", "sources") and v is not None}
+            operations.append(UpdateOne(
+                {"canonical_url": canonical_url},
+                {"$set": {**fields, "ingested_at": now},
+                 "$setOnInsert": {"first_seen_at": now},
+                 "$addToSet": {"sources": {"$each": doc["sources"]}}},
+                upsert=True,
+            ))
+        self.collection.bulk_write(operations, ordered=False)
+        return len(batch)
+
+    def _written_before_error(self, details):
+        return details.get("nUpserted", 0) + details.get("nMatched", 0)
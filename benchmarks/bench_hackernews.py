@@ -0,0 +1,67 @@
+"""Latency of get_hackernews_top with simulated upstream delay.
+
+Compares the old serial item loop against the bounded-parallel fetch,
+cold and with a warm item cache. Run from the repo root:
+
+    python benchmarks/bench_hackernews.py --latency 0.15
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import sources  # noqa: E402
+
+
+def fake_safe_request(latency, top_ids):
+    def safe_request(url, headers=None):
+        time.sleep(latency)
+        if url.endswith("/topstories.json"):
+            return list(top_ids)
+        story_id = int(url.rsplit("/", 1)[1].split(".")[0])
+        return {"id": story_id, "title": f"Story {story_id}", "url": f"https://example.com/{story_id}"}
+    return safe_request
+
+
+def serial_baseline():
+    top_ids = sources.safe_request(f"{sources.HN_API_URL}/topstories.json")[:sources.HN_TOP_N]
+    return [sources.safe_request(f"{sources.HN_API_URL}/item/{sid}.json") for sid in top_ids]
+
+
+def timed(fn, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return sum(samples) / len(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.15, help="simulated seconds per upstream request")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    sources.safe_request = fake_safe_request(args.latency, range(1, 31))
+
+    serial = timed(serial_baseline, args.runs)
+
+    def cold():
+        sources.hn_item_cache.clear()
+        sources.get_hackernews_top()
+
+    parallel_cold = timed(cold, args.runs)
+    sources.get_hackernews_top()
+    parallel_warm = timed(sources.get_hackernews_top, args.runs)
+
+    print(f"upstream latency:     {args.latency * 1000:.0f} ms, {sources.HN_TOP_N} items, {sources.HN_MAX_WORKERS} workers")
+    print(f"serial (old):         {serial * 1000:.0f} ms")
+    print(f"parallel, cold cache: {parallel_cold * 1000:.0f} ms  (saves {(serial - parallel_cold) * 1000:.0f} ms)")
+    print(f"parallel, warm cache: {parallel_warm * 1000:.0f} ms  (saves {(serial - parallel_warm) * 1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Serialisation cost of large history payloads.
+
+Compares the old path (per-document str(_id)/isoformat loop, then Flask's
+stdlib encoder) with FastJSONProvider, which encodes ObjectId and datetime
+natively.
+
+    python benchmarks/bench_json.py --docs 5000
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import json_provider  # noqa: E402
+from json_provider import FastJSONProvider  # noqa: E402
+
+
+def make_history(n):
+    start = datetime(2024, 1, 1)
+    return [{
+        "_id": ObjectId(),
+        "session_id": "6f1c2a9e-3b7d-4e0a-9a55-0c2d8f1e7b11",
+        "question": f"What happened with story number {i}?",
+        "answer": "A fairly long generated answer about the news. " * 10,
+        "timestamp": start + timedelta(seconds=i),
+    } for i in range(n)]
+
+
+def old_path(app, docs):
+    with app.app_context():
+        for doc in docs:
+            doc["_id"] = str(doc["_id"])
+            doc["timestamp"] = doc["timestamp"].isoformat()
+        return app.json.response(docs).get_data()
+
+
+def new_path(app, docs):
+    with app.app_context():
+        return app.json.response(docs).get_data()
+
+
+def best_of(fn, app, docs, runs):
+    best = None
+    for _ in range(runs):
+        fresh = [dict(d) for d in docs]
+        start = time.perf_counter()
+        fn(app, fresh)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    docs = make_history(args.docs)
+
+    old_app = Flask("old")
+    old_app.json = DefaultJSONProvider(old_app)
+    fast_app = Flask("fast")
+    fast_app.json = FastJSONProvider(fast_app)
+
+    old = best_of(old_path, old_app, docs, args.runs)
+    fast = best_of(new_path, fast_app, docs, args.runs)
+    print(f"{args.docs} history documents, best of {args.runs}")
+    print(f"loop + stdlib json:        {old * 1000:8.1f} ms")
+    if json_provider.orjson is None:
+        print("orjson not installed; FastJSONProvider is using the stdlib fallback")
+    print(f"FastJSONProvider (native): {fast * 1000:8.1f} ms  ({old / fast:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
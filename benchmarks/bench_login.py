@@ -0,0 +1,85 @@
+"""Login throughput and its effect on concurrent /get_news latency.
+
+Runs a burst of /login requests alongside /get_news traffic against the
+stub upstreams, once with bcrypt on the process pool (current code) and
+once with it inline on the request thread (previous behaviour).
+
+    python benchmarks/bench_login.py --logins 64 --login-concurrency 16
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from bench_routes import BENCH_EMAIL, BENCH_PASSWORD, run_route, seed, start_app  # noqa: E402
+from stub_upstreams import add_stub_arguments, config_from_args, start_stub_server, upstream_env  # noqa: E402
+
+
+def login_burst(base_url, total, concurrency):
+    start = time.perf_counter()
+
+    def one(_):
+        r = requests.post(f"{base_url}/login", json={"email": BENCH_EMAIL, "password": BENCH_PASSWORD})
+        return r.status_code
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        statuses = list(pool.map(one, range(total)))
+    wall = time.perf_counter() - start
+    return {"logins": total, "errors": sum(1 for s in statuses if s >= 400), "logins_per_s": round(total / wall, 1)}
+
+
+def measure(base_url, args):
+    get_news = lambda s, i: s.get(f"{base_url}/get_news")  # noqa: E731
+    baseline = run_route(get_news, args.news_requests, args.news_concurrency)
+
+    burst = {}
+    thread = threading.Thread(target=lambda: burst.update(login_burst(base_url, args.logins, args.login_concurrency)))
+    thread.start()
+    under_load = run_route(get_news, args.news_requests, args.news_concurrency)
+    thread.join()
+    return baseline, under_load, burst
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_stub_arguments(parser)
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--login-concurrency", type=int, default=16)
+    parser.add_argument("--news-requests", type=int, default=200)
+    parser.add_argument("--news-concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    stub, stub_url = start_stub_server(config_from_args(args))
+    os.environ.update(upstream_env(stub_url))
+
+    rows = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        news_app, server, base_url = start_app("mongomock://")
+        seed(base_url, 0)
+        requests.get(f"{base_url}/get_news")  # warm the headline cache
+
+        import passwords
+        pooled_run = passwords._run
+        rows.append(("process pool",) + measure(base_url, args))
+        passwords._run = lambda fn, *fn_args: fn(*fn_args)
+        rows.append(("inline",) + measure(base_url, args))
+        passwords._run = pooled_run
+        server.shutdown()
+
+    print(f"{'bcrypt':<14}{'logins/s':>10}{'news p50':>10}{'news p95':>10}{'news p99':>10}   (idle p50/p95)")
+    for label, baseline, loaded, burst in rows:
+        print(f"{label:<14}{burst['logins_per_s']:>10}{loaded['p50_ms']:>10}{loaded['p95_ms']:>10}"
+              f"{loaded['p99_ms']:>10}   ({baseline['p50_ms']}/{baseline['p95_ms']} ms)")
+
+
+if __name__ == "__main__":
+    main()
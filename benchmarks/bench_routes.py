@@ -0,0 +1,171 @@
+"""End-to-end latency benchmark of the Flask routes against local stub upstreams.
+
+Starts benchmarks/stub_upstreams.py in-process, points the app at it, uses
+mongomock (or --mongo-uri for a local MongoDB) and drives the routes under
+concurrency, reporting p50/p95/p99 latency and throughput per route.
+
+    python benchmarks/bench_routes.py --concurrency 16 --requests 200
+    python benchmarks/bench_routes.py --routes get_news,ask_newsbot --upstream-latency groq=800
+
+Cache settings come from the environment as usual, e.g. NEWS_CACHE_TTL=0
+measures the uncached path.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from stub_upstreams import add_stub_arguments, config_from_args, start_stub_server, upstream_env  # noqa: E402
+
+QUERIES = ["cricket", "ai", "election results", "climate change", "stock market",
+           "football", "health", "machine learning", "movies", "economy"]
+
+BENCH_EMAIL = "bench@example.com"
+BENCH_PASSWORD = "bench-password"
+
+
+def percentile(samples, pct):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def start_app(mongo_uri, verbose=False):
+    """Import the app with bench settings and serve it on a background thread"""
+    os.environ.setdefault("GNEWS_API_KEY", "bench")
+    os.environ.setdefault("GROQ_API_KEY", "bench")
+    os.environ.setdefault("LLM_CACHE_PATH", ":memory:")
+    os.environ.setdefault("SEARCH_INDEX_PATH", ":memory:")
+    # Background refreshes would hit the stubs between measured requests
+    os.environ.setdefault("INGEST_WORKER", "0")
+    os.environ["MONGO_URI"] = mongo_uri
+
+    from werkzeug.serving import WSGIRequestHandler, make_server
+    import app as news_app
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    handler = WSGIRequestHandler if verbose else QuietHandler
+    server = make_server("127.0.0.1", 0, news_app.app, threaded=True, request_handler=handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return news_app, server, f"http://127.0.0.1:{server.server_port}"
+
+
+def make_requests(base_url, token):
+    auth = {"Authorization": f"Bearer {token}"}
+    return {
+        "get_news": lambda s, i: s.get(f"{base_url}/get_news", params={"query": QUERIES[i % len(QUERIES)]}),
+        "headlines": lambda s, i: s.get(f"{base_url}/get_news"),
+        "ask_newsbot": lambda s, i: s.post(f"{base_url}/ask_newsbot", headers=auth,
+                                           json={"query": QUERIES[i % len(QUERIES)]}),
+        "generate_timeline": lambda s, i: s.get(f"{base_url}/generate_timeline",
+                                                params={"topic": QUERIES[i % len(QUERIES)]}),
+        "login": lambda s, i: s.post(f"{base_url}/login", json={"email": BENCH_EMAIL, "password": BENCH_PASSWORD}),
+        "chat_history": lambda s, i: s.get(f"{base_url}/chat_history", headers=auth),
+    }
+
+
+def seed(base_url, chats):
+    """Create the bench user and some chat history; returns a JWT"""
+    response = requests.post(f"{base_url}/login", json={"email": BENCH_EMAIL, "password": BENCH_PASSWORD})
+    response.raise_for_status()
+    token = response.json()["token"]
+    for i in range(chats):
+        requests.post(f"{base_url}/save_chat", headers={"Authorization": f"Bearer {token}"},
+                      json={"session_id": "bench", "question": f"question {i}", "answer": "answer " * 50})
+    return token
+
+
+def run_route(send, total, concurrency):
+    local = threading.local()
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+
+    def one(i):
+        nonlocal errors
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        start = time.perf_counter()
+        try:
+            response = send(local.session, i)
+            ok = response.status_code < 400
+        except requests.RequestException:
+            ok = False
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+            errors += 0 if ok else 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(total)))
+    wall = time.perf_counter() - start
+
+    ms = lambda v: round(v * 1000, 1) if v is not None else None  # noqa: E731
+    return {
+        "requests": total,
+        "errors": errors,
+        "p50_ms": ms(percentile(latencies, 50)),
+        "p95_ms": ms(percentile(latencies, 95)),
+        "p99_ms": ms(percentile(latencies, 99)),
+        "throughput_rps": round(total / wall, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_stub_arguments(parser)
+    parser.add_argument("--routes", default="get_news,headlines,ask_newsbot,generate_timeline,login,chat_history")
+    parser.add_argument("--requests", type=int, default=100, help="requests per route")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--chats", type=int, default=200, help="chat history entries to seed")
+    parser.add_argument("--mongo-uri", default="mongomock://", help="mongomock:// or a local MongoDB URI")
+    parser.add_argument("--json", dest="json_path", help="also write results to this file")
+    parser.add_argument("--verbose", action="store_true", help="show the app's own logging")
+    args = parser.parse_args()
+
+    stub, stub_url = start_stub_server(config_from_args(args))
+    os.environ.update(upstream_env(stub_url))
+
+    quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    results = {}
+    with quiet:
+        news_app, server, base_url = start_app(args.mongo_uri, args.verbose)
+        token = seed(base_url, args.chats)
+        senders = make_requests(base_url, token)
+        for route in args.routes.split(","):
+            if route not in senders:
+                raise SystemExit(f"unknown route '{route}', expected one of {', '.join(senders)}")
+            results[route] = run_route(senders[route], args.requests, args.concurrency)
+        server.shutdown()
+
+    header = f"{'route':<18}{'reqs':>6}{'errs':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>9}"
+    print(header)
+    print("-" * len(header))
+    for route, r in results.items():
+        print(f"{route:<18}{r['requests']:>6}{r['errors']:>6}{r['p50_ms']:>10}{r['p95_ms']:>10}"
+              f"{r['p99_ms']:>10}{r['throughput_rps']:>9}")
+    print(f"\nupstream calls: {stub.RequestHandlerClass.config.requests}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""Local stand-ins for GNews, Google News RSS, Reddit, Hacker News, Wikipedia and Groq.
+
+One threaded HTTP server answers every upstream under its own path prefix:
+
+    /gnews/...      GNews v4 search and top-headlines
+    /rss/search     Google News RSS
+    /reddit/...     r/worldnews top listing
+    /hn/...         Hacker News topstories and items
+    /wikipedia/...  "On this day" feed
+    /groq/...       Groq chat completions, plain and streamed
+
+Latency, error rate and payload size are configurable per upstream.
+Run standalone with `python benchmarks/stub_upstreams.py --port 8900`.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from xml.sax.saxutils import escape
+
+UPSTREAMS = ["gnews", "rss", "reddit", "hn", "wikipedia", "groq"]
+
+
+class StubConfig:
+    def __init__(self, latency=0.1, error_rate=0.0, items=10, text_bytes=200, overrides=None):
+        self.latency = {name: latency for name in UPSTREAMS}
+        self.error_rate = {name: error_rate for name in UPSTREAMS}
+        self.items = items
+        self.text_bytes = text_bytes
+        self.requests = {name: 0 for name in UPSTREAMS}
+        self._lock = threading.Lock()
+        for name, value in (overrides or {}).items():
+            self.latency[name] = value
+
+    def count(self, name):
+        with self._lock:
+            self.requests[name] += 1
+
+
+def _text(n, seed):
+    words = ("market policy election storm court league launch study budget summit "
+             "vaccine rally merger outage ruling climate").split()
+    rng = random.Random(seed)
+    out = []
+    while sum(len(w) + 1 for w in out) < n:
+        out.append(rng.choice(words))
+    return " ".join(out)
+
+
+def _published(i):
+    return (datetime.utcnow() - timedelta(minutes=7 * i)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    config = StubConfig()
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body, content_type="application/json"):
+        data = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _upstream(self):
+        name = self.path.lstrip("/").split("/", 1)[0]
+        return name if name in UPSTREAMS else None
+
+    def _simulate(self, name):
+        cfg = self.config
+        cfg.count(name)
+        time.sleep(cfg.latency[name])
+        if random.random() < cfg.error_rate[name]:
+            self._send(500, {"error": "injected failure"})
+            return False
+        return True
+
+    def do_GET(self):
+        name = self._upstream()
+        if name is None or name == "groq":
+            return self._send(404, {"error": "not found"})
+        if not self._simulate(name):
+            return
+
+        cfg = self.config
+        path = self.path.split("?", 1)[0]
+        if name == "gnews":
+            articles = [{
+                "title": f"GNews story {i}: {_text(40, i)}",
+                "description": _text(cfg.text_bytes, i + 1000),
+                "content": _text(cfg.text_bytes * 2, i + 2000),
+                "url": f"https://publisher{i % 5}.example.com/news/{i}",
+                "image": f"https://img.example.com/{i}.jpg",
+                "publishedAt": _published(i),
+                "source": {"name": f"Publisher {i % 5}", "url": f"https://publisher{i % 5}.example.com"}
+            } for i in range(cfg.items)]
+            self._send(200, {"totalArticles": len(articles), "articles": articles})
+        elif name == "rss":
+            items = "".join(
+                f"<item><title>{escape(f'RSS story {i}: {_text(40, i)}')}</title>"
+                f"<link>https://news.example.com/rss/{i}</link>"
+                f"<description>{escape(_text(cfg.text_bytes, i + 3000))}</description>"
+                f"<pubDate>{datetime.utcnow().strftime('%a, %d %b %Y %H:%M:%S GMT')}</pubDate></item>"
+                for i in range(cfg.items)
+            )
+            body = f'<?xml version="1.0"?><rss version="2.0"><channel><title>Stub</title>{items}</channel></rss>'
+            self._send(200, body.encode("utf-8"), "application/rss+xml")
+        elif name == "reddit":
+            children = [{"data": {
+                "title": f"Reddit post {i}: {_text(40, i + 4000)}",
+                "url": f"https://world.example.com/{i}",
+                "created_utc": time.time() - 600 * i
+            }} for i in range(cfg.items)]
+            self._send(200, {"data": {"children": children}})
+        elif name == "hn":
+            if path.endswith("/topstories.json"):
+                self._send(200, list(range(1, 501)))
+            else:
+                story_id = int(path.rsplit("/", 1)[1].split(".")[0])
+                self._send(200, {"id": story_id, "title": f"HN story {story_id}",
+                                 "url": f"https://hn.example.com/{story_id}", "time": int(time.time())})
+        elif name == "wikipedia":
+            events = [{
+                "text": f"Historic event {i}: {_text(60, i + 5000)}",
+                "year": 1900 + i,
+                "pages": [{"content_urls": {"desktop": {"page": f"https://en.wikipedia.example/wiki/{i}"}}}]
+            } for i in range(cfg.items)]
+            self._send(200, {"events": events})
+
+    def do_POST(self):
+        if self._upstream() != "groq":
+            return self._send(404, {"error": "not found"})
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        if not self._simulate("groq"):
+            return
+
+        answer = json.dumps([{"date": datetime.utcnow().strftime("%Y-%m-%d"),
+                              "summary": _text(self.config.text_bytes, 7),
+                              "sources": [{"name": "Stub", "url": "https://news.example.com"}]}])
+        if not payload.get("stream"):
+            return self._send(200, {"choices": [{"message": {"role": "assistant", "content": answer}}]})
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        for start in range(0, len(answer), 16):
+            chunk = {"choices": [{"delta": {"content": answer[start:start + 16]}}]}
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.close_connection = True
+
+
+def start_stub_server(config, host="127.0.0.1", port=0):
+    """Start the stub server on a daemon thread; returns (server, base_url)"""
+    handler = type("ConfiguredStubHandler", (StubHandler,), {"config": config})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_port}"
+
+
+def upstream_env(base_url):
+    """Environment variables that point the app at a stub server"""
+    return {
+        "GNEWS_API_BASE": f"{base_url}/gnews",
+        "GOOGLE_NEWS_RSS_URL": f"{base_url}/rss/search",
+        "REDDIT_BASE_URL": f"{base_url}/reddit",
+        "HN_API_URL": f"{base_url}/hn",
+        "WIKIPEDIA_API_BASE": f"{base_url}/wikipedia",
+        "GROQ_API_URL": f"{base_url}/groq/openai/v1/chat/completions",
+    }
+
+
+def parse_latency_overrides(values):
+    overrides = {}
+    for value in values or []:
+        name, _, ms = value.partition("=")
+        if name not in UPSTREAMS:
+            raise SystemExit(f"unknown upstream '{name}', expected one of {', '.join(UPSTREAMS)}")
+        overrides[name] = float(ms) / 1000
+    return overrides
+
+
+def add_stub_arguments(parser):
+    parser.add_argument("--latency-ms", type=float, default=100, help="default upstream latency")
+    parser.add_argument("--upstream-latency", action="append", metavar="NAME=MS",
+                        help="per-upstream latency override, e.g. groq=800")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of upstream calls that fail with 500")
+    parser.add_argument("--items", type=int, default=10, help="articles per upstream response")
+    parser.add_argument("--text-bytes", type=int, default=200, help="approximate description length")
+
+
+def config_from_args(args):
+    return StubConfig(latency=args.latency_ms / 1000, error_rate=args.error_rate, items=args.items,
+                      text_bytes=args.text_bytes, overrides=parse_latency_overrides(args.upstream_latency))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_stub_arguments(parser)
+    parser.add_argument("--port", type=int, default=8900)
+    args = parser.parse_args()
+    server, base_url = start_stub_server(config_from_args(args), port=args.port)
+    print(f"Stub upstreams on {base_url}; export these to point the app at them:")
+    for key, value in upstream_env(base_url).items():
+        print(f"{key}={value}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,134 @@
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+
+STOPWORDS = {
+    "a", "an", "and", "are", "about", "at", "be", "by", "for", "from", "in", "is",
+    "latest", "news", "of", "on", "or", "the", "to", "with",
+}
+
+
+def normalize_query(query):
+    """Cache key for a search query: case-folded, whitespace-collapsed, stopwords dropped"""
+    words = re.sub(r"\s+", " ", (query or "").casefold()).strip().split(" ")
+    kept = [w for w in words if w not in STOPWORDS]
+    # A query made only of stopwords keeps them, so it doesn't collide with the headlines key
+    return " ".join(kept or words)
+
+
+def json_size(value):
+    """Approximate in-memory cost of a cached value, in bytes"""
+    return len(json.dumps(value, default=str))
+
+
+class TTLCache:
+    """Thread-safe LRU cache with per-entry TTL and an optional memory cap
+
+    With stale_ttl set, entries outlive their TTL by that many seconds so
+    get_stale() can still serve them while a refresh is in progress.
+    """
+
+    def __init__(self, maxsize=128, ttl=300, max_bytes=None, sizeof=json_size, stale_ttl=0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._data = OrderedDict()  # key -> (value, expires_at, stale_until, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        value, is_stale = self.get_stale(key)
+        if value is None or is_stale:
+            return default
+        return value
+
+    def get_stale(self, key):
+        """Return (value, is_stale); (None, False) when missing or past the stale window"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, False
+            now = time.monotonic()
+            if entry[2] <= now:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None, False
+            self._data.move_to_end(key)
+            if entry[1] <= now:
+                self.stale_hits += 1
+                return entry[0], True
+            self.hits += 1
+            return entry[0], False
+
+    def set(self, key, value, ttl=None):
+        size = self.sizeof(value) if self.max_bytes else 0
+        if self.max_bytes and size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (value, expires_at, expires_at + self.stale_ttl, size)
+            self._bytes += size
+            while len(self._data) > self.maxsize or (self.max_bytes and self._bytes > self.max_bytes):
+                oldest = next(iter(self._data))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            self._remove(key)
+            return entry[0]
+
+    def ttl_remaining(self, key):
+        """Seconds until the entry goes stale, 0 if missing or already stale"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return 0
+            return max(0, entry[1] - time.monotonic())
+
+    def __contains__(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and entry[1] > time.monotonic()
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def _remove(self, key):
+        size = self._data.pop(key)[3]
+        self._bytes -= size
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.stale_hits) / lookups, 3) if lookups else None,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
@@ -1,4 +1,5 @@
-from pymongo import MongoClient
+from pymongo import MongoClient, ASCENDING, DESCENDING
+from pymongo.errors import PyMongoError, ServerSelectionTimeoutError
 from dotenv import load_dotenv
 import os
 
@@ -11,8 +12,14 @@ MONGO_URI = os.getenv("MONGO_URI")
 if not MONGO_URI:
     raise ValueError("MONGO_URI is missing in .env")
 
-# Connect to MongoDB Atlas
-client = MongoClient(MONGO_URI)
+# Connect to MongoDB Atlas; "mongomock://" gives an in-memory stand-in for local benchmarks.
+# connect=False defers connecting (and the monitor threads) to the first operation, so importing
+# this module has no side effects
+if MONGO_URI.startswith("mongomock://"):
+    import mongomock
+    client = mongomock.MongoClient()
+else:
+    client = MongoClient(MONGO_URI, connect=False)
 
 # Select your database
 db = client["news_app"]
@@ -21,3 +28,91 @@ db = client["news_app"]
 users_collection = db["users"]
 chat_collection = db["chats"]
 search_logs = db["search_logs"]
+articles_collection = db["articles"]
+
+# Articles not seen by any fetch for this long are removed by the TTL index
+ARTICLES_TTL = int(os.getenv("ARTICLES_TTL", str(30 * 86400)))  # seconds
+
+
+# Indexes backing the hot queries in app.py: (collection, keys, options).
+# History indexes end in _id so keyset pagination on (timestamp, _id) is index-ordered.
+INDEXES = [
+    (users_collection, [("email", ASCENDING)], {"name": "email_unique", "unique": True}),
+    (chat_collection, [("email", ASCENDING), ("session_id", ASCENDING), ("timestamp", ASCENDING), ("_id", ASCENDING)],
+     {"name": "email_session_timestamp_id"}),
+    # /chat_history without a session_id sorts by timestamp across sessions
+    (chat_collection, [("email", ASCENDING), ("timestamp", ASCENDING), ("_id", ASCENDING)],
+     {"name": "email_timestamp_id"}),
+    (search_logs, [("email", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)],
+     {"name": "email_timestamp_id_desc"}),
+    (articles_collection, [("canonical_url", ASCENDING)], {"name": "canonical_url_unique", "unique": True}),
+    (articles_collection, [("ingested_at", ASCENDING)], {"name": "ingested_at_ttl", "expireAfterSeconds": ARTICLES_TTL}),
+    (articles_collection, [("published_at", DESCENDING)], {"name": "published_at_desc"}),
+]
+
+# Representative queries whose plans must not scan the whole collection
+PLAN_CHECKS = [
+    ("users by email", lambda: users_collection.find({"email": ""})),
+    ("chats by email", lambda: chat_collection.find({"email": ""})
+        .sort([("timestamp", ASCENDING), ("_id", ASCENDING)])),
+    ("chats by session", lambda: chat_collection.find({"email": "", "session_id": ""})
+        .sort([("timestamp", ASCENDING), ("_id", ASCENDING)])),
+    ("search history", lambda: search_logs.find({"email": ""})
+        .sort([("timestamp", DESCENDING), ("_id", DESCENDING)])),
+    ("recent articles", lambda: articles_collection.find({}).sort([("published_at", DESCENDING)]).limit(50)),
+    ("article by url", lambda: articles_collection.find({"canonical_url": ""})),
+]
+
+
+def _plan_stages(plan):
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan["stage"]
+        for value in plan.values():
+            yield from _plan_stages(value)
+    elif isinstance(plan, list):
+        for value in plan:
+            yield from _plan_stages(value)
+
+
+def ensure_indexes():
+    """Create the INDEXES idempotently, verify them and report plans that still scan
+
+    Returns {"created": [...], "missing": [...], "collection_scans": [...]}.
+    """
+    report = {"created": [], "missing": [], "collection_scans": []}
+
+    for collection, keys, options in INDEXES:
+        try:
+            collection.create_index(keys, **options)
+            report["created"].append(f"{collection.name}.{options['name']}")
+        except ServerSelectionTimeoutError as e:
+            print(f"[WARN] MongoDB unreachable, skipping index provisioning: {e}")
+            return report
+        except PyMongoError as e:
+            print(f"[WARN] Could not create index {collection.name}.{options['name']}: {e}")
+
+    for collection, keys, options in INDEXES:
+        try:
+            existing = collection.index_information()
+        except PyMongoError as e:
+            print(f"[WARN] Could not list indexes on {collection.name}: {e}")
+            continue
+        if not any(info.get("key") == keys for info in existing.values()):
+            report["missing"].append(f"{collection.name}.{options['name']}")
+
+    for label, cursor in PLAN_CHECKS:
+        try:
+            plan = cursor().explain().get("queryPlanner", {}).get("winningPlan", {})
+        except Exception as e:
+            print(f"[WARN] Could not explain '{label}': {e}")
+            continue
+        if "COLLSCAN" in set(_plan_stages(plan)):
+            report["collection_scans"].append(label)
+
+    if report["missing"]:
+        print(f"[WARN] Missing indexes: {', '.join(report['missing'])}")
+    if report["collection_scans"]:
+        print(f"[WARN] Queries still scanning collections: {', '.join(report['collection_scans'])}")
+    print(f"[INFO] MongoDB indexes ensured: {len(report['created'])}/{len(INDEXES)}")
+    return report
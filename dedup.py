@@ -0,0 +1,146 @@
+import hashlib
+import html
+import random
+import re
+from functools import lru_cache
+from cache import STOPWORDS
+from urls import url_hash
+
+# Items whose word sets (stopwords removed) overlap at least this much (Jaccard) are the
+# same story. Headlines that differ in one key word ("rises"/"falls", "Japan"/"Turkey")
+# stay below the title bar; title+description is only compared when both items have one.
+TITLE_THRESHOLD = 0.75
+FULL_THRESHOLD = 0.65
+THRESHOLDS = {"title": TITLE_THRESHOLD, "full": FULL_THRESHOLD}
+# MinHash signature of BANDS * ROWS values; two sets with Jaccard 0.65 share a band with p > 0.999
+BANDS = 16
+ROWS = 2
+
+# One random mask per signature slot; XOR with a random mask stands in for a permutation of
+# the (already uniformly distributed) token hashes, at a fraction of the cost of a*h+b mod p
+_rng = random.Random(0x5EED)
+_MASKS = [_rng.getrandbits(64) for _ in range(BANDS * ROWS)]
+
+_TAG = re.compile(r"<[^>]+>")
+_WORD = re.compile(r"[^\W_]+")
+# " - The Hindu", " | Reuters": a short trailing segment naming the publisher
+_PUBLISHER_SUFFIX = re.compile(r"\s+[-|–—]\s+(?:\S+\s+){0,4}\S+\s*$")
+
+
+def normalize_text(text):
+    """Lower-cased words of a title or description, without markup or punctuation"""
+    text = html.unescape(_TAG.sub(" ", text or ""))
+    return _WORD.findall(text.casefold())
+
+
+def strip_publisher(title):
+    stripped = _PUBLISHER_SUFFIX.sub("", title or "")
+    # Keep titles that are nothing but "A - B"
+    return stripped if len(stripped.split()) >= 3 else title or ""
+
+
+@lru_cache(maxsize=65536)
+def _hash(token):
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def minhash(tokens):
+    """MinHash signature of a token set"""
+    hashes = [_hash(token) for token in tokens]
+    return [min(h ^ mask for h in hashes) for mask in _MASKS]
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+def _bands(signature):
+    return [(band, tuple(signature[band * ROWS:(band + 1) * ROWS])) for band in range(BANDS)]
+
+
+def _content_words(text):
+    words = normalize_text(text)
+    # A text made only of stopwords keeps them rather than vanishing
+    return frozenset(word for word in words if word not in STOPWORDS) or frozenset(words)
+
+
+def signatures(item):
+    """(kind, words, MinHash) for an item's title, plus title+description when it has one
+
+    Reddit and HN items carry no description, so titles are also compared on
+    their own; the combined set catches rewritten headlines over the same
+    wire copy.
+    """
+    title_words = _content_words(strip_publisher(item.get("title", "")))
+    if not title_words:
+        return []
+    title_signature = minhash(title_words)
+    sets = [("title", title_words, title_signature)]
+    description_words = _content_words(item.get("description", "")) - title_words
+    if description_words:
+        # The MinHash of a union is the element-wise minimum of the parts' MinHashes
+        full_signature = list(map(min, title_signature, minhash(description_words)))
+        sets.append(("full", title_words | description_words, full_signature))
+    return sets
+
+
+def _attribution(item):
+    source = item.get("source")
+    return {**source, "url": item.get("url", "")} if source else None
+
+
+def _merge(canonical, item):
+    attribution = _attribution(item)
+    if attribution and attribution not in canonical["sources"]:
+        canonical["sources"].append(attribution)
+    if not canonical.get("description") and item.get("description"):
+        canonical["description"] = item["description"]
+
+
+def merge_near_duplicates(items):
+    """Collapse near-duplicate items into their first occurrence, in one pass
+
+    Each kept item gains a "sources" list attributing every feed that carried
+    the story. Items linking to the same canonical URL are matched through a
+    hash index; otherwise candidates come from LSH banding over MinHash
+    signatures and are confirmed with the exact Jaccard similarity, so the
+    work per item doesn't grow with the number of items kept so far.
+    """
+    merged = []
+    by_url = {}  # url_hash -> index in merged
+    buckets = {}  # (kind, band, rows) -> [(index in merged, words)]
+
+    for item in items:
+        sets = [(kind, words, _bands(signature)) for kind, words, signature in signatures(item)]
+        if not sets:
+            continue
+
+        url = item.get("url", "")
+        key = url_hash(url) if url.startswith("http") else None
+        match = by_url.get(key) if key else None
+        for kind, words, bands in sets:
+            if match is not None:
+                break
+            for band in bands:
+                for index, other in buckets.get((kind,) + band, ()):
+                    if jaccard(words, other) >= THRESHOLDS[kind]:
+                        match = index
+                        break
+                if match is not None:
+                    break
+
+        if match is None:
+            match = len(merged)
+            attribution = _attribution(item)
+            merged.append({**item, "sources": [attribution] if attribution else []})
+        else:
+            _merge(merged[match], item)
+
+        if key:
+            by_url.setdefault(key, match)
+
+        for kind, words, bands in sets:
+            for band in bands:
+                buckets.setdefault((kind,) + band, []).append((match, words))
+
+    return merged
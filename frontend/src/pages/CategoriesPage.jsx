@@ -66,6 +66,24 @@ const CategoriesPage = () => {
     }
   };
 
+  // Live updates: the server pushes new articles for the selected category as they land
+  useEffect(() => {
+    const query = activeSubcategory || activeCategory;
+    if (!query) return;
+
+    const source = new EventSource(`http://localhost:5000/news_stream?category=${encodeURIComponent(query)}`);
+    source.addEventListener("articles", (event) => {
+      const { articles } = JSON.parse(event.data);
+      if (!articles.length) return;
+      setNews((current) => {
+        const known = new Set(current.map((article) => article.url));
+        return [...articles.filter((article) => !known.has(article.url)), ...current];
+      });
+    });
+
+    return () => source.close();
+  }, [activeCategory, activeSubcategory]);
+
   // Handle main category selection
   const handleCategoryClick = (category) => {
     // If clicking the same category, toggle it off
@@ -1,6 +1,9 @@
 import { useState, useEffect, useRef } from "react";
 import styles from "../styles/Chatbot.module.css";
 
+// Ask the backend to stream the answer over Server-Sent Events
+const STREAM_ANSWERS = true;
+
 const Chatbot = () => {
   const [messages, setMessages] = useState([]);
   const [input, setInput] = useState("");
@@ -35,6 +38,35 @@ const Chatbot = () => {
     }
   };
 
+  // Read "delta" / "done" / "error" events from an SSE response body,
+  // calling onText with the answer accumulated so far
+  const readAnswerStream = async (response, onText) => {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+    let answer = "";
+
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+
+      const events = buffer.split("\n\n");
+      buffer = events.pop();
+      for (const raw of events) {
+        const event = (raw.match(/^event: (.*)$/m) || [])[1];
+        const data = JSON.parse((raw.match(/^data: (.*)$/m) || [])[1] || "{}");
+        if (event === "delta") {
+          answer += data.text;
+          onText(answer);
+        } else if (event === "error") {
+          throw new Error(data.message || "Stream failed");
+        }
+      }
+    }
+    return answer;
+  };
+
   const sendMessage = async () => {
     if (!input.trim()) return;
 
@@ -48,12 +80,34 @@ const Chatbot = () => {
         method: "POST",
         headers: { 
           "Content-Type": "application/json",
-          "Accept": "application/json"
+          "Accept": STREAM_ANSWERS ? "text/event-stream, application/json" : "application/json"
         },
         credentials: "include",
-        body: JSON.stringify({ query: input }),
+        body: JSON.stringify({ query: input, stream: STREAM_ANSWERS }),
       });
 
+      const contentType = response.headers.get("Content-Type") || "";
+      if (response.ok && contentType.includes("text/event-stream")) {
+        setMessages(prev => [...prev, { role: "bot", content: "" }]);
+        setLoading(false);
+        const updateBotMessage = (text) => setMessages(prev => [
+          ...prev.slice(0, -1),
+          { role: "bot", content: formatText(text) }
+        ]);
+        try {
+          const answer = await readAnswerStream(response, updateBotMessage);
+          updateBotMessage(answer || "No answer available.");
+        } catch (streamErr) {
+          console.error("Stream error:", streamErr);
+          const fallbackNews = await getFallbackNews(input);
+          updateBotMessage(
+            `⚠️ I couldn't generate a comprehensive answer about "${input}" right now.\n\n` +
+            `Here are some related news items instead:\n\n${fallbackNews}`
+          );
+        }
+        return;
+      }
+
       const data = await response.json();
       
       // Check for various error conditions
@@ -1,6 +1,6 @@
 from db import users_collection, digests_collection
 from datetime import datetime
-import requests
+import http_client
 import os
 from dotenv import load_dotenv
 
@@ -18,14 +18,15 @@ Summarize major updates and developments from the past 7 days grouped by topic.
 Use bullet points and explain clearly.
 """
 
-    response = requests.post(
+    response = http_client.post(
         "https://api.groq.com/openai/v1/chat/completions",
         headers={"Authorization": f"Bearer {os.getenv('GROQ_API_KEY')}"},
         json={
             "model": "mixtral-8x7b-32768",
             "messages": [{"role": "user", "content": prompt}],
             "temperature": 0.7
-        }
+        },
+        timeout=http_client.LLM_TIMEOUT
     )
 
     if response.status_code != 200:
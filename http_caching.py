@@ -0,0 +1,96 @@
+import gzip
+import hashlib
+from flask import current_app, request
+from cache import TTLCache
+
+try:
+    import brotli
+except ImportError:  # optional; gzip is always available
+    brotli = None
+
+MIN_COMPRESS_BYTES = 512
+
+# Encoded bodies per cache key, reused while the cached payload object is unchanged
+_encoded = TTLCache(maxsize=256, ttl=24 * 3600)
+
+
+class _Representations:
+    def __init__(self, payload):
+        self.payload = payload
+        self.body = (current_app.json.dumps(payload) + "\n").encode("utf-8")
+        self.digest = hashlib.sha256(self.body).hexdigest()[:32]
+        self._compressed = {}
+
+    def etag(self, coding):
+        return f'"{self.digest}-{coding}"' if coding else f'"{self.digest}"'
+
+    def encoded(self, coding):
+        if coding is None:
+            return self.body
+        if coding not in self._compressed:
+            if coding == "br":
+                self._compressed[coding] = brotli.compress(self.body, quality=5)
+            else:
+                self._compressed[coding] = gzip.compress(self.body, compresslevel=6)
+        return self._compressed[coding]
+
+
+def _accepted_codings():
+    accepted = {}
+    for part in request.headers.get("Accept-Encoding", "").split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if coding:
+            accepted[coding.lower()] = q
+    return accepted
+
+
+def _negotiate(size):
+    if size < MIN_COMPRESS_BYTES:
+        return None
+    accepted = _accepted_codings()
+    if brotli is not None and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+
+def _if_none_match():
+    header = request.headers.get("If-None-Match", "")
+    return {tag.strip().removeprefix("W/") for tag in header.split(",") if tag.strip()}
+
+
+def cached_json_response(key, payload, max_age):
+    """JSON response with a content-hash ETag, If-None-Match handling and negotiated compression
+
+    key identifies the cache entry the payload came from, so its encodings are
+    computed once per cached payload rather than per request. max_age is the
+    remaining freshness of that entry in seconds.
+    """
+    reps = _encoded.get(key)
+    if reps is None or reps.payload is not payload:
+        reps = _Representations(payload)
+        _encoded.set(key, reps)
+
+    max_age = int(max_age)
+    headers = {
+        "Cache-Control": f"public, max-age={max_age}" if max_age > 0 else "no-cache",
+        "Vary": "Accept-Encoding",
+    }
+
+    coding = _negotiate(len(reps.body))
+    headers["ETag"] = reps.etag(coding)
+
+    client_tags = _if_none_match()
+    if "*" in client_tags or client_tags & {reps.etag(None), reps.etag("gzip"), reps.etag("br")}:
+        return current_app.response_class(status=304, headers=headers)
+
+    if coding:
+        headers["Content-Encoding"] = coding
+    return current_app.response_class(reps.encoded(coding), mimetype="application/json", headers=headers)
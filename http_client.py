@@ -0,0 +1,113 @@
+import os
+import random
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Outbound HTTP settings, overridable from .env
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "3.05"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "10"))
+HTTP_LLM_READ_TIMEOUT = float(os.getenv("HTTP_LLM_READ_TIMEOUT", "60"))  # completions are slow to start
+HTTP_POOL_HOSTS = int(os.getenv("HTTP_POOL_HOSTS", "16"))       # hosts kept in the pool manager
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "20"))         # keep-alive connections per host
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "2"))
+HTTP_BACKOFF = float(os.getenv("HTTP_BACKOFF", "0.25"))         # base delay in seconds
+HTTP_BACKOFF_MAX = float(os.getenv("HTTP_BACKOFF_MAX", "4"))
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Safe to resend after the server may have seen them; others (POST) only retry when never sent
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+DEFAULT_TIMEOUT = (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+LLM_TIMEOUT = (HTTP_CONNECT_TIMEOUT, HTTP_LLM_READ_TIMEOUT)
+
+
+def _build_session():
+    s = requests.Session()
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_HOSTS, pool_maxsize=HTTP_POOL_SIZE)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    s.headers.update({"User-Agent": "NewsBot/1.0"})
+    return s
+
+
+# One process-wide session: connections are reused across requests per host
+session = _build_session()
+
+
+def backoff_delay(attempt):
+    # Full jitter: uniform between 0 and the capped exponential delay
+    return random.uniform(0, min(HTTP_BACKOFF_MAX, HTTP_BACKOFF * (2 ** attempt)))
+
+
+def _never_sent(exc):
+    """True when the request failed before reaching the server (connect timeout, refused, DNS)"""
+    if isinstance(exc, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(exc.args[0], "reason", None) if exc.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+def _clamp_timeout(timeout, remaining):
+    if isinstance(timeout, tuple):
+        return tuple(min(t, remaining) for t in timeout)
+    return min(timeout, remaining)
+
+
+def request(method, url, retries=None, timeout=None, deadline=None, **kwargs):
+    """Send a request on the shared session, retrying transient failures
+
+    Non-idempotent methods are only retried when the connection could not be
+    established, so a POST the server may have processed (read timeout, 429,
+    5xx) is never sent twice. With a deadline (a time.monotonic() value), each
+    attempt's timeout is cut to the time remaining and no retry is started
+    that couldn't finish before it.
+    """
+    retries = HTTP_RETRIES if retries is None else retries
+    idempotent = method.upper() in IDEMPOTENT_METHODS
+    timeout = timeout or DEFAULT_TIMEOUT
+
+    for attempt in range(retries + 1):
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise requests.exceptions.Timeout(f"Deadline passed before {method} {url}")
+            kwargs["timeout"] = _clamp_timeout(timeout, remaining)
+        else:
+            kwargs["timeout"] = timeout
+        response = None
+        try:
+            response = session.request(method, url, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as exc:
+            if attempt >= retries or not (idempotent or _never_sent(exc)):
+                raise
+            error = exc
+        else:
+            if response.status_code not in RETRY_STATUSES or attempt >= retries or not idempotent:
+                return response
+
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            delay = min(float(retry_after), HTTP_BACKOFF_MAX)
+        else:
+            delay = backoff_delay(attempt)
+        if deadline is not None and time.monotonic() + delay >= deadline:
+            # No time left for another attempt: surface this one's outcome
+            if response is not None:
+                return response
+            raise error
+        if response is not None:
+            response.close()
+        time.sleep(delay)
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
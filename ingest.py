@@ -0,0 +1,162 @@
+import random
+import threading
+import time
+from datetime import datetime, timezone
+
+
+class QuotaBudget:
+    """Daily request allowance for an upstream API, plus a token bucket for bursts
+
+    Every upstream call is recorded with spend(); background work checks
+    available(reserve) first, so it never eats into the share of the daily
+    quota kept for user-facing cache misses.
+    """
+
+    def __init__(self, daily_limit, per_second=1.0, burst=1):
+        self.daily_limit = daily_limit
+        self.per_second = per_second
+        self.burst = burst
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._day = self._today()
+        self._used_today = 0
+        self._lock = threading.Lock()
+        self.denied = 0
+
+    @staticmethod
+    def _today():
+        return datetime.now(timezone.utc).date()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.per_second)
+        self._refilled_at = now
+        today = self._today()
+        if today != self._day:
+            self._day = today
+            self._used_today = 0
+
+    def spend(self):
+        """Record an upstream call"""
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            self._used_today += 1
+
+    def available(self, reserve=0):
+        """Whether an optional call may go ahead: a token is free and more than `reserve` calls are left today"""
+        with self._lock:
+            self._refill()
+            if self._tokens < 1 or self.daily_limit - self._used_today <= reserve:
+                self.denied += 1
+                return False
+            return True
+
+    def remaining_today(self):
+        with self._lock:
+            self._refill()
+            return max(0, self.daily_limit - self._used_today)
+
+    def stats(self):
+        with self._lock:
+            self._refill()
+            return {
+                "daily_limit": self.daily_limit,
+                "used_today": self._used_today,
+                "denied": self.denied,
+            }
+
+
+class IngestJob:
+    def __init__(self, cache_key, query, weight):
+        self.cache_key = cache_key
+        self.query = query
+        self.weight = weight
+        self.interval = None  # seconds; None when there is no budget to refresh it
+        self.due_at = 0
+        self.runs = 0
+        self.failures = 0
+
+
+class IngestWorker:
+    """Keeps a fixed set of news queries fresh in the shared cache from a background thread
+
+    Each job's period is derived from the daily budget and its weight, so
+    heavier jobs (the headlines) refresh more often, and every period is
+    jittered so the jobs don't synchronise. refresh(query, cache_key, ttl) is
+    expected to fetch and store the query with that TTL, which outlasts the
+    next scheduled refresh so the entry never expires between runs.
+    """
+
+    def __init__(self, jobs, refresh, quota, daily_budget, min_interval=600, jitter=0.1, reserve=0):
+        self.jobs = jobs
+        self.refresh = refresh
+        self.quota = quota
+        self.jitter = jitter
+        self.reserve = reserve
+        self._stop = threading.Event()
+        self._thread = None
+
+        total_weight = sum(job.weight for job in jobs)
+        now = time.monotonic()
+        for job in jobs:
+            if daily_budget > 0:
+                job.interval = max(min_interval, 86400 * total_weight / (daily_budget * job.weight))
+            # Warm everything soon after startup, spread out so it isn't one burst
+            job.due_at = now + random.uniform(0, 30)
+
+    def _jittered(self, seconds):
+        return seconds * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="ingest", daemon=True)
+            self._thread.start()
+            print(f"[INFO] Ingest worker started with {len(self.jobs)} jobs")
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            scheduled = [job for job in self.jobs if job.interval]
+            if not scheduled:
+                return
+            job = min(scheduled, key=lambda j: j.due_at)
+            delay = job.due_at - time.monotonic()
+            if delay > 0 and self._stop.wait(delay):
+                return
+
+            if not self.quota.available(self.reserve):
+                # Rate limited: retry in a moment; out of today's budget: back off for longer
+                backoff = 300 if self.quota.remaining_today() <= self.reserve else 2
+                job.due_at = time.monotonic() + self._jittered(backoff)
+                continue
+
+            # The next refresh is at most interval * (1 + jitter) away; keep the entry fresh until then
+            ttl = job.interval * (1 + self.jitter) + 60
+            try:
+                self.refresh(job.query, job.cache_key, ttl)
+                job.runs += 1
+            except Exception as e:
+                job.failures += 1
+                print(f"[WARN] Ingest of '{job.cache_key}' failed: {e}")
+            job.due_at = time.monotonic() + self._jittered(job.interval)
+
+    def covers(self, cache_key):
+        """Whether the running worker keeps this cache key fresh"""
+        return self._thread is not None and self._thread.is_alive() and \
+            any(job.cache_key == cache_key and job.interval for job in self.jobs)
+
+    def stats(self):
+        now = time.monotonic()
+        return {
+            "running": self._thread is not None and self._thread.is_alive(),
+            "quota": self.quota.stats(),
+            "jobs": {job.cache_key: {
+                "interval": round(job.interval) if job.interval else None,
+                "due_in": round(max(0, job.due_at - now)),
+                "runs": job.runs,
+                "failures": job.failures,
+            } for job in self.jobs},
+        }
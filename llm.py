@@ -0,0 +1,136 @@
+import json
+import os
+from dotenv import load_dotenv
+import http_client
+from admission import AdmissionController
+from llm_cache import LLMCache, cache_key
+from singleflight import SingleFlight
+
+load_dotenv()
+
+GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+GROQ_API_URL = os.getenv("GROQ_API_URL", "https://api.groq.com/openai/v1/chat/completions")
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "llm_cache.sqlite3")
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", "1800"))  # seconds
+LLM_MAX_IN_FLIGHT = int(os.getenv("LLM_MAX_IN_FLIGHT", "4"))
+LLM_MAX_QUEUE = int(os.getenv("LLM_MAX_QUEUE", "16"))
+LLM_QUEUE_TIMEOUT = float(os.getenv("LLM_QUEUE_TIMEOUT", "10"))  # seconds
+
+# Identical in-flight completions share one upstream request
+llm_flight = SingleFlight()
+# Completed responses, keyed by cache_key(payload); opened by init_cache()
+llm_cache = None
+# Limits how many request threads can be parked on Groq at once
+admission = AdmissionController(LLM_MAX_IN_FLIGHT, LLM_MAX_QUEUE, LLM_QUEUE_TIMEOUT)
+
+
+def init_cache():
+    """Open the response cache at LLM_CACHE_PATH; call once per process before complete()/stream()"""
+    global llm_cache
+    if llm_cache is None:
+        llm_cache = LLMCache(LLM_CACHE_PATH, ttl=LLM_CACHE_TTL)
+    return llm_cache
+
+
+def _headers():
+    return {
+        "Authorization": f"Bearer {GROQ_API_KEY}",
+        "Content-Type": "application/json"
+    }
+
+
+def _post_completion(payload, key, ttl):
+    with admission.slot():
+        response = http_client.post(GROQ_API_URL, headers=_headers(), json=payload, timeout=http_client.LLM_TIMEOUT)
+
+    print(f"Groq API Status Code: {response.status_code}")
+    if response.status_code != 200:
+        print(f"Groq API Error Response: {response.text}")
+
+    response.raise_for_status()
+    content = response.json()["choices"][0]["message"]["content"]
+    llm_cache.set(key, content, ttl)
+    return content
+
+
+def complete(payload, ttl=None):
+    """Return the assistant message for a Groq chat-completion payload
+
+    Answers are cached for ttl seconds (LLM_CACHE_TTL by default); pass the
+    remaining freshness of the articles in the prompt so answers expire with them.
+    Raises admission.Overloaded when the call is shed.
+    """
+    key = cache_key(payload)
+    cached = llm_cache.get(key)
+    if cached is not None:
+        print("Serving cached LLM response")
+        return cached
+    return llm_flight.do(key, _post_completion, payload, key, ttl)
+
+
+class _SlotStream:
+    """Iterator over streamed deltas that holds an admission slot until exhausted or closed"""
+
+    def __init__(self, deltas, acquired_at):
+        self._deltas = deltas
+        self._acquired_at = acquired_at
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return next(self._deltas)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        if self._acquired_at is not None:
+            self._deltas.close()
+            admission.release(self._acquired_at)
+            self._acquired_at = None
+
+    __del__ = close
+
+
+def stream(payload, ttl=None):
+    """Return an iterator of content deltas of a streamed Groq chat completion
+
+    Admission happens here, before any output, so a shed call raises
+    admission.Overloaded instead of failing mid-stream.
+    """
+    key = cache_key(payload)
+    cached = llm_cache.get(key)
+    if cached is not None:
+        print("Serving cached LLM response")
+        return iter([cached])
+
+    acquired_at = admission.acquire()
+    return _SlotStream(_stream_completion(payload, key, ttl), acquired_at)
+
+
+def _stream_completion(payload, key, ttl):
+    parts = []
+    response = http_client.post(GROQ_API_URL, headers=_headers(), json=dict(payload, stream=True),
+                                timeout=http_client.LLM_TIMEOUT, stream=True)
+    try:
+        print(f"Groq API Status Code: {response.status_code}")
+        if response.status_code != 200:
+            print(f"Groq API Error Response: {response.text}")
+        response.raise_for_status()
+
+        response.encoding = "utf-8"
+        for line in response.iter_lines(decode_unicode=True):
+            if not line or not line.startswith("data:"):
+                continue
+            data = line[len("data:"):].strip()
+            if data == "[DONE]":
+                break
+            delta = json.loads(data)["choices"][0].get("delta", {}).get("content")
+            if delta:
+                parts.append(delta)
+                yield delta
+        llm_cache.set(key, "".join(parts), ttl)
+    finally:
+        response.close()
@@ -0,0 +1,82 @@
+import bisect
+import itertools
+import threading
+import time
+from urls import url_hash
+
+# Cursors from an earlier process are recognised and answered with a full snapshot
+FEED_EPOCH = format(int(time.time()), "x")
+
+_sequence = itertools.count(1)
+
+
+def parse_cursor(cursor):
+    """Sequence number in a feed cursor; 0 (everything) for empty, foreign or malformed cursors"""
+    epoch, _, seq = (cursor or "").partition("-")
+    if epoch != FEED_EPOCH or not seq.isdigit():
+        return 0
+    return int(seq)
+
+
+def make_cursor(seq):
+    return f"{FEED_EPOCH}-{seq}"
+
+
+def article_identity(article):
+    url = article.get("url", "")
+    return url_hash(url) if url.startswith("http") else article.get("title")
+
+
+class ArticleFeed:
+    """Articles ordered by ingestion, for "what's new since cursor X" queries
+
+    Each previously unseen article gets the next value of a process-wide
+    sequence; since() bisects on it, so a poll costs O(log n + changes).
+    """
+
+    def __init__(self, max_items=500):
+        self.max_items = max_items
+        self._seqs = []
+        self._articles = []
+        self._seen = set()
+        self._lock = threading.Lock()
+
+    def add(self, articles):
+        """Index unseen articles; returns the newly added ones, newest first"""
+        added = []
+        with self._lock:
+            # Lists arrive newest first; give the newest the highest sequence number
+            for article in reversed(articles):
+                identity = article_identity(article)
+                if not identity or identity in self._seen:
+                    continue
+                self._seen.add(identity)
+                self._seqs.append(next(_sequence))
+                self._articles.append(article)
+                added.append(article)
+
+            overflow = len(self._articles) - self.max_items
+            if overflow > 0:
+                for article in self._articles[:overflow]:
+                    self._seen.discard(article_identity(article))
+                del self._seqs[:overflow]
+                del self._articles[:overflow]
+        added.reverse()
+        return added
+
+    def since(self, cursor):
+        """Articles ingested after cursor (newest first) and the cursor to poll with next"""
+        seq = parse_cursor(cursor)
+        with self._lock:
+            start = bisect.bisect_right(self._seqs, seq)
+            articles = self._articles[start:][::-1]
+            latest = self._seqs[-1] if self._seqs else seq
+        return articles, make_cursor(max(latest, seq))
+
+    def cursor(self):
+        """Cursor to poll with for articles ingested from now on"""
+        with self._lock:
+            return make_cursor(self._seqs[-1] if self._seqs else 0)
+
+    def __len__(self):
+        return len(self._articles)
@@ -0,0 +1,101 @@
+import threading
+import time
+from admission import Overloaded
+
+
+class Subscription:
+    def __init__(self, topic):
+        self.topic = topic
+        self._wake = threading.Event()
+
+    def notify(self):
+        self._wake.set()
+
+    def wait(self, timeout):
+        """Block until new articles are published for the topic; False on timeout"""
+        woke = self._wake.wait(timeout)
+        self._wake.clear()
+        return woke
+
+
+class Broadcaster:
+    """Per-topic fan-out of "new articles" notifications to SSE subscribers
+
+    Subscribers are only woken up by publish(); they read what they missed
+    from the topic's ArticleFeed with their own cursor, so a slow client never
+    holds a backlog here. New articles normally arrive through the ingest
+    worker or cache misses. For topics nothing else keeps fresh, one
+    background thread offers refresh(topic) a single topic every `interval`
+    seconds, least recently refreshed first. refresh returns True when it
+    actually went upstream. With interval None there is no refresher.
+    """
+
+    def __init__(self, refresh, interval=60, max_topics=32):
+        self.refresh = refresh
+        self.interval = interval
+        self.max_topics = max_topics
+        self._topics = {}  # topic -> set of Subscription
+        self._refreshed_at = {}  # topic -> monotonic time of its last upstream refresh
+        self._lock = threading.Lock()
+        self._refresher = None
+        self.published = 0
+        self.refreshes = 0
+
+    def subscribe(self, topic):
+        with self._lock:
+            if topic not in self._topics and len(self._topics) >= self.max_topics:
+                raise Overloaded(f"Already streaming {self.max_topics} topics", retry_after=60)
+            subscription = Subscription(topic)
+            self._topics.setdefault(topic, set()).add(subscription)
+            if self.interval and (self._refresher is None or not self._refresher.is_alive()):
+                self._refresher = threading.Thread(target=self._refresh_loop, name="news-stream-refresh", daemon=True)
+                self._refresher.start()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._topics.get(subscription.topic)
+            if subscribers is None:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._topics[subscription.topic]
+                self._refreshed_at.pop(subscription.topic, None)
+
+    def publish(self, topic):
+        with self._lock:
+            subscribers = list(self._topics.get(topic, ()))
+            self.published += 1
+        for subscription in subscribers:
+            subscription.notify()
+
+    def _refresh_loop(self):
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._topics:
+                    # Nobody listening; the next subscribe() starts a new thread
+                    self._refresher = None
+                    return
+                topics = sorted(self._topics, key=lambda t: self._refreshed_at.get(t, 0))
+            # At most one upstream call per tick, so the period bounds the daily spend
+            for topic in topics:
+                try:
+                    refreshed = self.refresh(topic)
+                except Exception as e:
+                    print(f"[WARN] Stream refresh failed for '{topic}': {e}")
+                    refreshed = True
+                if refreshed:
+                    with self._lock:
+                        self._refreshed_at[topic] = time.monotonic()
+                        self.refreshes += 1
+                    break
+
+    def stats(self):
+        with self._lock:
+            return {
+                "topics": len(self._topics),
+                "subscribers": sum(len(s) for s in self._topics.values()),
+                "published": self.published,
+                "refreshes": self.refreshes,
+            }
@@ -0,0 +1,78 @@
+import base64
+from datetime import datetime
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import ASCENDING, DESCENDING
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(doc):
+    """Opaque keyset cursor for a document: its (timestamp, _id) position"""
+    raw = f"{doc['timestamp'].isoformat()}|{doc['_id']}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Inverse of encode_cursor; raises ValueError for malformed cursors"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        timestamp, object_id = raw.split("|")
+        return datetime.fromisoformat(timestamp), ObjectId(object_id)
+    except (ValueError, UnicodeDecodeError, InvalidId):
+        raise ValueError("Invalid cursor")
+
+
+def parse_limit(value):
+    if value in (None, ""):
+        return DEFAULT_PAGE_SIZE
+    limit = int(value)
+    if limit < 1:
+        raise ValueError("limit must be positive")
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def keyset_page(collection, query, projection, newest_first, limit, before=None, after=None):
+    """Fetch one page ordered by (timestamp, _id)
+
+    Without a cursor the page holds the newest `limit` entries. before/after
+    select entries older/newer than a cursor. The page comes back in the
+    endpoint's natural order, along with the cursor for the next page, or None
+    if there is none: pass it back as after when paging with after, otherwise
+    as before.
+    """
+    if before and after:
+        raise ValueError("Use either before or after, not both")
+
+    # Direction we walk the index in: towards newer entries only for an explicit after
+    walk_backwards = not after
+    cursor = before or after
+    if cursor:
+        timestamp, object_id = decode_cursor(cursor)
+        op = "$lt" if walk_backwards else "$gt"
+        query = {"$and": [query, {"$or": [
+            {"timestamp": {op: timestamp}},
+            {"timestamp": timestamp, "_id": {op: object_id}},
+        ]}]}
+
+    order = DESCENDING if walk_backwards else ASCENDING
+    docs = list(collection.find(query, projection)
+                .sort([("timestamp", order), ("_id", order)])
+                .limit(limit + 1))
+
+    has_more = len(docs) > limit
+    docs = docs[:limit]
+    next_cursor = encode_cursor(docs[-1]) if has_more and docs else None
+
+    if walk_backwards != newest_first:
+        docs.reverse()
+    return docs, next_cursor
+
+
+def stream_json_array(docs, dumps):
+    """Yield a JSON array chunk by chunk instead of building one large string"""
+    yield "["
+    for i, doc in enumerate(docs):
+        yield ("," if i else "") + dumps(doc)
+    yield "]"
@@ -0,0 +1,126 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+import bcrypt
+from dotenv import load_dotenv
+
+load_dotenv()
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+BCRYPT_MAX_PENDING = int(os.getenv("BCRYPT_MAX_PENDING", "64"))
+BCRYPT_QUEUE_TIMEOUT = float(os.getenv("BCRYPT_QUEUE_TIMEOUT", "5"))  # seconds
+
+
+class PasswordServiceBusy(Exception):
+    """Raised when the hashing pool is saturated or a job misses its deadline"""
+
+    def __init__(self, message, retry_after=1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _hash(password, rounds):
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds))
+
+
+def _check(password, hashed):
+    return bcrypt.checkpw(password, hashed)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+_pending = threading.BoundedSemaphore(BCRYPT_MAX_PENDING)
+_stats_lock = threading.Lock()
+stats = {"hashed": 0, "verified": 0, "rejected": 0, "timed_out": 0, "rehashed": 0, "pool_restarts": 0}
+
+
+def _get_pool():
+    # Created lazily, and from a forkserver rather than by forking the threaded web
+    # process, whose held locks (pymongo, logging, our own) would be copied locked
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=BCRYPT_WORKERS,
+                                        mp_context=multiprocessing.get_context("forkserver"))
+        return _pool
+
+
+def _discard_pool(broken):
+    # Replaced on the next call; another thread may already have swapped it
+    global _pool
+    with _pool_lock:
+        if _pool is not broken:
+            return
+        _pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+    _count("pool_restarts")
+
+
+def _count(key):
+    with _stats_lock:
+        stats[key] += 1
+
+
+def _run(fn, *args):
+    if not _pending.acquire(blocking=False):
+        _count("rejected")
+        raise PasswordServiceBusy("Too many password operations in progress")
+    pool = _get_pool()
+    try:
+        future = pool.submit(fn, *args)
+        try:
+            return future.result(timeout=BCRYPT_QUEUE_TIMEOUT)
+        except FutureTimeout:
+            future.cancel()
+            _count("timed_out")
+            raise PasswordServiceBusy("Password operation timed out")
+    except BrokenProcessPool:
+        # A worker died (OOM, SIGKILL); the executor is unusable from now on
+        print("[WARN] Password pool broken, starting a new one")
+        _discard_pool(pool)
+        raise PasswordServiceBusy("Password service restarting")
+    finally:
+        _pending.release()
+
+
+def hash_password(password):
+    """bcrypt hash of a str password at BCRYPT_ROUNDS, computed off the request thread"""
+    hashed = _run(_hash, password.encode("utf-8"), BCRYPT_ROUNDS)
+    _count("hashed")
+    return hashed
+
+
+def _as_bytes(hashed):
+    return hashed.encode("utf-8") if isinstance(hashed, str) else bytes(hashed)
+
+
+def verify_password(password, hashed):
+    result = _run(_check, password.encode("utf-8"), _as_bytes(hashed))
+    _count("verified")
+    return result
+
+
+def needs_rehash(hashed):
+    """True when a stored hash was made with a different cost than BCRYPT_ROUNDS"""
+    try:
+        hashed = _as_bytes(hashed)
+        return int(hashed.split(b"$")[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+
+def rehash_if_needed(password, hashed):
+    """New hash at the current cost for a password that just verified, or None if up to date"""
+    if not needs_rehash(hashed):
+        return None
+    new_hash = hash_password(password)
+    _count("rehashed")
+    return new_hash
+
+
+def pool_stats():
+    with _stats_lock:
+        return dict(stats, workers=BCRYPT_WORKERS, rounds=BCRYPT_ROUNDS)
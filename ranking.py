@@ -0,0 +1,85 @@
+import math
+from collections import Counter
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from cache import STOPWORDS
+from dedup import normalize_text
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+# Title words count this many times over description words
+TITLE_WEIGHT = 2
+# Recency multiplier halves every RECENCY_HALF_LIFE hours, down to RECENCY_FLOOR
+# (which is also what undated items get)
+RECENCY_HALF_LIFE = 24.0
+RECENCY_FLOOR = 0.3
+
+
+def tokenize(text):
+    """Search terms of a text: normalised words without stopwords"""
+    return [word for word in normalize_text(text) if word not in STOPWORDS]
+
+
+def document_terms(item):
+    return tokenize(item.get("title", "")) * TITLE_WEIGHT + tokenize(item.get("description", ""))
+
+
+def idf(n_docs, doc_freq):
+    return math.log(1 + (n_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+
+
+def bm25_term(tf, doc_len, avg_len, term_idf):
+    return term_idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * doc_len / avg_len))
+
+
+def parse_published(value):
+    """Aware datetime from an ISO 8601 or RFC 822 timestamp; None if missing or unparseable"""
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def recency(published_at, now):
+    published = parse_published(published_at)
+    if published is None:
+        return RECENCY_FLOOR
+    age_hours = max(0.0, (now - published).total_seconds() / 3600)
+    return RECENCY_FLOOR + (1 - RECENCY_FLOOR) * 0.5 ** (age_hours / RECENCY_HALF_LIFE)
+
+
+def rank_articles(items, query, limit=None, now=None):
+    """Items ordered by BM25 relevance to the query times a recency decay
+
+    Scores the whole pool in one pass, using the pool itself for document
+    frequencies. Items scoring the same (e.g. matching no query term) are
+    ordered newest first, then in the incoming order.
+    """
+    now = now or datetime.now(timezone.utc)
+    query_terms = set(tokenize(query))
+    docs = [Counter(document_terms(item)) for item in items]
+    if not docs:
+        return []
+
+    n_docs = len(docs)
+    avg_len = sum(sum(doc.values()) for doc in docs) / n_docs or 1
+    idfs = {term: idf(n_docs, sum(1 for doc in docs if term in doc)) for term in query_terms}
+
+    scored = []
+    for position, (item, doc) in enumerate(zip(items, docs)):
+        doc_len = sum(doc.values())
+        relevance = sum(bm25_term(doc[term], doc_len, avg_len, idfs[term]) for term in query_terms if term in doc)
+        freshness = recency(item.get("published_at"), now)
+        scored.append((relevance * freshness, freshness, position, item))
+
+    # Items matching no query term fall back to newest first
+    scored.sort(key=lambda s: (-s[0], -s[1], s[2]))
+    ranked = [item for *_, item in scored]
+    return ranked[:limit] if limit is not None else ranked
@@ -0,0 +1,174 @@
+import sqlite3
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from ranking import bm25_term, document_terms, idf, parse_published, recency, tokenize
+from urls import url_hash
+
+ARTICLE_FIELDS = ("url", "title", "description", "image", "published_at")
+
+
+class SearchIndex:
+    """Articles we've fetched, searchable without another upstream call
+
+    Rows persist in SQLite so the corpus survives restarts; an in-process
+    inverted index (term -> {article key: term frequency}) over title and
+    description answers queries with BM25 times the same recency decay as
+    ranking.rank_articles. add() updates both incrementally.
+    """
+
+    PURGE_EVERY = 500  # articles added between sweeps of rows past retention
+
+    def __init__(self, path, retention=7 * 86400):
+        self.path = path
+        self.retention = retention
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS articles ("
+            " key TEXT PRIMARY KEY,"
+            " url TEXT NOT NULL,"
+            " title TEXT NOT NULL,"
+            " description TEXT,"
+            " image TEXT,"
+            " published_at TEXT,"
+            " ingested_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+        self._docs = {}  # key -> (article, term counts, length)
+        self._postings = {}  # term -> {key: tf}
+        self._total_len = 0
+        self._added = 0
+        self.searches = 0
+        self.answered = 0
+        self._load()
+
+    def _load(self):
+        cutoff = time.time() - self.retention
+        with self._lock:
+            self._conn.execute("DELETE FROM articles WHERE ingested_at <= ?", (cutoff,))
+            self._conn.commit()
+            rows = self._conn.execute(f"SELECT key, {', '.join(ARTICLE_FIELDS)} FROM articles").fetchall()
+            for key, *values in rows:
+                self._index(key, dict(zip(ARTICLE_FIELDS, values)))
+        print(f"[INFO] Search index loaded {len(rows)} articles from {self.path}")
+
+    def _index(self, key, article):
+        terms = Counter(document_terms(article))
+        length = sum(terms.values())
+        self._docs[key] = (article, terms, length)
+        self._total_len += length
+        for term, tf in terms.items():
+            self._postings.setdefault(term, {})[key] = tf
+
+    def _unindex(self, key):
+        _, terms, length = self._docs.pop(key)
+        self._total_len -= length
+        for term in terms:
+            postings = self._postings[term]
+            del postings[key]
+            if not postings:
+                del self._postings[term]
+
+    def add(self, articles):
+        """Insert or update articles; returns how many were new or changed
+
+        Every article passed in, changed or not, has its ingested_at refreshed,
+        so retention counts from the last time an article was fetched.
+        """
+        now = time.time()
+        rows = []
+        seen = []  # keys of unchanged articles, kept from expiring while they're still fetched
+        with self._lock:
+            for item in articles:
+                url = item.get("url") or ""
+                if not url.startswith("http") or not item.get("title"):
+                    continue
+                article = {field: item.get(field) for field in ARTICLE_FIELDS}
+                key = url_hash(url)
+                existing = self._docs.get(key)
+                if existing and existing[0]["title"] == article["title"] \
+                        and existing[0]["description"] == article["description"]:
+                    seen.append((now, key))
+                    continue
+                if existing:
+                    self._unindex(key)
+                self._index(key, article)
+                rows.append((key, *(article[field] for field in ARTICLE_FIELDS), now))
+
+            if rows:
+                self._conn.executemany(
+                    f"INSERT OR REPLACE INTO articles (key, {', '.join(ARTICLE_FIELDS)}, ingested_at)"
+                    f" VALUES ({', '.join('?' * (len(ARTICLE_FIELDS) + 2))})", rows
+                )
+            if seen:
+                self._conn.executemany("UPDATE articles SET ingested_at = ? WHERE key = ?", seen)
+            if rows or seen:
+                self._conn.commit()
+            before = self._added
+            self._added += len(rows)
+            purge = self._added // self.PURGE_EVERY > before // self.PURGE_EVERY
+        if purge:
+            self.purge_expired()
+        return len(rows)
+
+    def purge_expired(self):
+        cutoff = time.time() - self.retention
+        with self._lock:
+            expired = [key for (key,) in self._conn.execute(
+                "SELECT key FROM articles WHERE ingested_at <= ?", (cutoff,))]
+            self._conn.execute("DELETE FROM articles WHERE ingested_at <= ?", (cutoff,))
+            self._conn.commit()
+            for key in expired:
+                if key in self._docs:
+                    self._unindex(key)
+
+    def search(self, query, limit=10, min_results=1, max_age=None, now=None):
+        """Best matches containing every query term, or [] when coverage is insufficient
+
+        Coverage is insufficient with fewer than min_results matches, or when
+        max_age (seconds) is set and none of them was published that recently.
+        """
+        now = now or datetime.now(timezone.utc)
+        terms = set(tokenize(query))
+        with self._lock:
+            self.searches += 1
+            postings = [self._postings.get(term) for term in terms]
+            if not terms or not all(postings) or not self._docs:
+                return []
+
+            n_docs = len(self._docs)
+            avg_len = self._total_len / n_docs or 1
+            # Walk the shortest posting list, probing the others
+            postings.sort(key=len)
+            idfs = [idf(n_docs, len(p)) for p in postings]
+            scored = []
+            for key in postings[0]:
+                if not all(key in p for p in postings[1:]):
+                    continue
+                article, _, length = self._docs[key]
+                relevance = sum(bm25_term(p[key], length, avg_len, term_idf) for p, term_idf in zip(postings, idfs))
+                scored.append((relevance * recency(article["published_at"], now), article))
+
+        if len(scored) < min_results:
+            return []
+        if max_age is not None:
+            published = [parse_published(article["published_at"]) for _, article in scored]
+            if not any(p and (now - p).total_seconds() <= max_age for p in published):
+                return []
+
+        scored.sort(key=lambda s: -s[0])
+        with self._lock:
+            self.answered += 1
+        return [dict(article) for _, article in scored[:limit]]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "articles": len(self._docs),
+                "terms": len(self._postings),
+                "searches": self.searches,
+                "answered": self.answered,
+            }
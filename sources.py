@@ -1,7 +1,14 @@
+import calendar
 import os
-import requests
+import time
+import threading
 import feedparser
-from datetime import datetime
+import http_client
+from dedup import merge_near_duplicates
+from ingest import QuotaBudget
+from urls import clean_url
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timezone
 from dotenv import load_dotenv
 import urllib.parse
 
@@ -10,10 +17,43 @@ load_dotenv()
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 GNEWS_API_KEY = os.getenv("GNEWS_API_KEY")
 
+# Upstream endpoints, overridable to point at local stand-ins (see benchmarks/)
+GNEWS_API_BASE = os.getenv("GNEWS_API_BASE", "https://gnews.io/api/v4")
+GOOGLE_NEWS_RSS_URL = os.getenv("GOOGLE_NEWS_RSS_URL", "https://news.google.com/rss/search")
+REDDIT_BASE_URL = os.getenv("REDDIT_BASE_URL", "https://www.reddit.com")
+HN_API_URL = os.getenv("HN_API_URL", "https://hacker-news.firebaseio.com/v0")
+WIKIPEDIA_API_BASE = os.getenv("WIKIPEDIA_API_BASE", "https://en.wikipedia.org/api/rest_v1")
+
+# GNews quota, charged by every GNews call in the process (get_gnews and the app's own fetches)
+GNEWS_DAILY_QUOTA = int(os.getenv("GNEWS_DAILY_QUOTA", "100"))  # requests per UTC day
+GNEWS_RATE_PER_SEC = float(os.getenv("GNEWS_RATE_PER_SEC", "1"))
+gnews_quota = QuotaBudget(GNEWS_DAILY_QUOTA, per_second=GNEWS_RATE_PER_SEC)
+
+# Overall budget (seconds) for one fetch_all_news_sources call
+SOURCES_DEADLINE = float(os.getenv("SOURCES_DEADLINE", "8"))
+# Fetches of one source allowed to run or queue at once, so a slow source can't hold the whole pool
+SOURCES_MAX_IN_FLIGHT = int(os.getenv("SOURCES_MAX_IN_FLIGHT", "4"))
+
+# Deadline (time.monotonic()) of the fetch running on this thread, bounding its upstream calls
+_fetch_context = threading.local()
+
+
+def _deadline():
+    return getattr(_fetch_context, "deadline", None)
+
+
+def _with_deadline(deadline, fn, *args):
+    previous = _deadline()
+    _fetch_context.deadline = deadline
+    try:
+        return fn(*args)
+    finally:
+        _fetch_context.deadline = previous
+
 
 def safe_request(url, headers=None):
     try:
-        response = requests.get(url, headers=headers or {}, timeout=10)
+        response = http_client.get(url, headers=headers or {}, deadline=_deadline())
         response.raise_for_status()
         return response.json()
     except Exception as e:
@@ -21,12 +61,23 @@ def safe_request(url, headers=None):
         return {}
 
 
+def _epoch_iso(seconds):
+    if not isinstance(seconds, (int, float)):
+        return None
+    return datetime.fromtimestamp(seconds, timezone.utc).isoformat()
+
+
+def _struct_time_iso(parsed):
+    return _epoch_iso(calendar.timegm(parsed)) if parsed else None
+
+
 def get_gnews(query):
     if not GNEWS_API_KEY:
         print("[WARN] Missing GNEWS_API_KEY")
         return []
 
-    url = f"https://gnews.io/api/v4/search?q={query}&token={GNEWS_API_KEY}&lang=en"
+    url = f"{GNEWS_API_BASE}/search?q={query}&token={GNEWS_API_KEY}&lang=en"
+    gnews_quota.spend()
     data = safe_request(url)
     articles = data.get("articles", [])
 
@@ -35,6 +86,7 @@ def get_gnews(query):
             "title": a.get("title", ""),
             "description": a.get("description", ""),
             "url": a.get("url", ""),
+            "published_at": a.get("publishedAt"),
             "source": {"name": a.get("source", {}).get("name", "GNews")}
         }
         for a in articles
@@ -43,15 +95,18 @@ def get_gnews(query):
 
 def get_google_news_rss(query):
     encoded_query = urllib.parse.quote(query)
-    rss_url = f"https://news.google.com/rss/search?q={encoded_query}&hl=en-IN&gl=IN&ceid=IN:en"
+    rss_url = f"{GOOGLE_NEWS_RSS_URL}?q={encoded_query}&hl=en-IN&gl=IN&ceid=IN:en"
     
     try:
-        feed = feedparser.parse(rss_url)
+        response = http_client.get(rss_url, deadline=_deadline())
+        response.raise_for_status()
+        feed = feedparser.parse(response.content)
         return [
             {
                 "title": entry.get("title", ""),
                 "description": entry.get("summary", ""),
                 "url": entry.get("link", ""),
+                "published_at": _struct_time_iso(entry.get("published_parsed")),
                 "source": {"name": "Google News"}
             }
             for entry in feed.entries[:10]
@@ -63,7 +118,7 @@ def get_google_news_rss(query):
 
 def get_reddit_news():
     headers = {"User-Agent": "NewsBot/1.0"}
-    url = "https://www.reddit.com/r/worldnews/top/.json?limit=10"
+    url = f"{REDDIT_BASE_URL}/r/worldnews/top/.json?limit=10"
     data = safe_request(url, headers=headers)
 
     children = data.get("data", {}).get("children", [])
@@ -72,27 +127,67 @@ def get_reddit_news():
             "title": item["data"].get("title", ""),
             "description": "",
             "url": item["data"].get("url", ""),
+            "published_at": _epoch_iso(item["data"].get("created_utc")),
             "source": {"name": "Reddit - r/worldnews"}
         }
         for item in children
     ]
 
 
+HN_TOP_N = 10
+HN_MAX_WORKERS = int(os.getenv("HN_MAX_WORKERS", "5"))
+HN_ITEM_TTL = int(os.getenv("HN_ITEM_TTL", "900"))  # seconds
+
+_hn_pool = ThreadPoolExecutor(max_workers=HN_MAX_WORKERS, thread_name_prefix="hn-item")
+
+# Hydrated HN items by ID: {story_id: (story, fetched_at)}
+hn_item_cache = {}
+_hn_cache_lock = threading.Lock()
+
+
+def _get_hn_item(story_id):
+    now = time.monotonic()
+    with _hn_cache_lock:
+        cached = hn_item_cache.get(story_id)
+    if cached and now - cached[1] < HN_ITEM_TTL:
+        return cached[0]
+
+    story = safe_request(f"{HN_API_URL}/item/{story_id}.json")
+    if story:
+        with _hn_cache_lock:
+            hn_item_cache[story_id] = (story, now)
+    return story
+
+
+def _prune_hn_cache():
+    now = time.monotonic()
+    with _hn_cache_lock:
+        expired = [sid for sid, (_, fetched_at) in hn_item_cache.items() if now - fetched_at >= HN_ITEM_TTL]
+        for sid in expired:
+            del hn_item_cache[sid]
+
+
 def get_hackernews_top():
-    url = "https://hacker-news.firebaseio.com/v0/topstories.json"
     try:
-        top_ids = requests.get(url, timeout=10).json()[:10]
-        articles = []
-        for story_id in top_ids:
-            story = safe_request(f"https://hacker-news.firebaseio.com/v0/item/{story_id}.json")
-            if story and "title" in story:
-                articles.append({
-                    "title": story.get("title", ""),
-                    "description": "",
-                    "url": story.get("url", ""),
-                    "source": {"name": "Hacker News"}
-                })
-        return articles
+        top_ids = safe_request(f"{HN_API_URL}/topstories.json")
+        if not isinstance(top_ids, list):
+            return []
+
+        _prune_hn_cache()
+        deadline = _deadline()
+        stories = _hn_pool.map(lambda sid: _with_deadline(deadline, _get_hn_item, sid), top_ids[:HN_TOP_N])
+
+        return [
+            {
+                "title": story.get("title", ""),
+                "description": "",
+                "url": story.get("url", ""),
+                "published_at": _epoch_iso(story.get("time")),
+                "source": {"name": "Hacker News"}
+            }
+            for story in stories
+            if story and "title" in story
+        ]
     except Exception as e:
         print(f"[ERROR] Hacker News fetch failed: {e}")
         return []
@@ -100,7 +195,7 @@ def get_hackernews_top():
 
 def get_wikipedia_current_events():
     date_path = datetime.utcnow().strftime("%m/%d")
-    url = f"https://en.wikipedia.org/api/rest_v1/feed/onthisday/events/{date_path}"
+    url = f"{WIKIPEDIA_API_BASE}/feed/onthisday/events/{date_path}"
     data = safe_request(url)
 
     events = data.get("events", [])
@@ -109,28 +204,92 @@ def get_wikipedia_current_events():
             "title": e.get("text", ""),
             "description": "",
             "url": e.get("pages", [{}])[0].get("content_urls", {}).get("desktop", {}).get("page", ""),
+            "published_at": None,  # historical events
             "source": {"name": "Wikipedia - On This Day"}
         }
         for e in events
     ]
 
 
-def fetch_all_news_sources(query="world"):
-    all_news = (
-        get_gnews(query) +
-        get_google_news_rss(query) +
-        get_reddit_news() +
-        get_hackernews_top() +
-        get_wikipedia_current_events()
-    )
+# Merge order of the aggregated results; query-driven sources come first
+NEWS_SOURCES = [
+    ("gnews", get_gnews, True),
+    ("google_news_rss", get_google_news_rss, True),
+    ("reddit", get_reddit_news, False),
+    ("hackernews", get_hackernews_top, False),
+    ("wikipedia", get_wikipedia_current_events, False),
+]
+
+# Shared pool so stragglers from a timed-out call don't block the next one
+_source_pool = ThreadPoolExecutor(max_workers=len(NEWS_SOURCES) * SOURCES_MAX_IN_FLIGHT,
+                                  thread_name_prefix="news-source")
+_source_slots = {name: threading.BoundedSemaphore(SOURCES_MAX_IN_FLIGHT) for name, _, _ in NEWS_SOURCES}
+
+# Latest timing per source: {"name": {"seconds": float, "status": str, "items": int}}
+source_timings = {}
+_timings_lock = threading.Lock()
+
+
+def _timed_fetch(name, fetch, args, deadline):
+    """(items, timing) for one source; releases the source's in-flight slot when done"""
+    start = time.perf_counter()
+    status = "ok"
+    items = []
+    try:
+        items = _with_deadline(deadline, fetch, *args)
+    except Exception as e:
+        status = "error"
+        print(f"[ERROR] Source {name} failed: {e}")
+    finally:
+        _source_slots[name].release()
+    elapsed = time.perf_counter() - start
+    return items, {"seconds": round(elapsed, 3), "status": status, "items": len(items)}
+
+
+def fetch_all_news_sources(query="world", deadline=None):
+    deadline = SOURCES_DEADLINE if deadline is None else deadline
+    start = time.perf_counter()
+    fetch_deadline = time.monotonic() + deadline
+
+    futures = []
+    timings = {}
+    for name, fetch, takes_query in NEWS_SOURCES:
+        if not _source_slots[name].acquire(blocking=False):
+            # Earlier calls' fetches of this source are still running; don't queue behind them
+            timings[name] = {"seconds": 0, "status": "busy", "items": 0}
+            continue
+        args = (query,) if takes_query else ()
+        futures.append((name, _source_pool.submit(_timed_fetch, name, fetch, args, fetch_deadline)))
+    wait([f for _, f in futures], timeout=deadline)
+
+    all_news = []
+    late = []
+    for name, future in futures:
+        if future.done():
+            items, timings[name] = future.result()
+            all_news.extend(items)
+        else:
+            # Queued fetches never start; running ones stop at the deadline and go unrecorded
+            if future.cancel():
+                _source_slots[name].release()
+            timings[name] = {"seconds": deadline, "status": "timeout", "items": 0}
+            late.append(name)
+
+    with _timings_lock:
+        source_timings.update(timings)
+    if late:
+        print(f"[WARN] Sources missed the {deadline}s deadline: {', '.join(late)}")
+    busy = [name for name, timing in timings.items() if timing["status"] == "busy"]
+    if busy:
+        print(f"[WARN] Sources skipped, {SOURCES_MAX_IN_FLIGHT} fetches already in flight: {', '.join(busy)}")
+    print(f"[INFO] Aggregated {len(all_news)} items in {time.perf_counter() - start:.2f}s")
 
-    # Deduplicate by title
-    seen_titles = set()
-    unique_news = []
+    # Publisher URLs rather than aggregator redirects or tracking variants
     for item in all_news:
-        title = item.get("title", "")
-        if title and title not in seen_titles:
-            seen_titles.add(title)
-            unique_news.append(item)
+        item["url"] = clean_url(item.get("url", ""))
 
+    # Same story from several feeds: keep the first, attributing every source
+    unique_news = merge_near_duplicates(all_news)
+    if len(unique_news) < len(all_news):
+        print(f"[INFO] Merged {len(all_news) - len(unique_news)} near-duplicate items")
     return unique_news
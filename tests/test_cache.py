@@ -0,0 +1,76 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import cache  # noqa: E402
+from cache import TTLCache, normalize_query  # noqa: E402
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache.time, "monotonic", clock)
+    return clock
+
+
+def test_entries_go_stale_then_expire(clock):
+    c = TTLCache(ttl=10, stale_ttl=5)
+    c.set("k", "v")
+    assert c.get("k") == "v" and "k" in c
+
+    clock.now += 11
+    assert c.get("k") is None
+    assert "k" not in c
+    assert c.get_stale("k") == ("v", True)
+    assert c.ttl_remaining("k") == 0
+
+    clock.now += 5
+    assert c.get_stale("k") == (None, False)
+    assert c.stats()["expirations"] == 1
+
+
+def test_per_entry_ttl(clock):
+    c = TTLCache(ttl=10)
+    c.set("short", 1, ttl=2)
+    c.set("long", 2)
+    clock.now += 3
+    assert c.get("short") is None
+    assert c.get("long") == 2
+
+
+def test_evicts_least_recently_used(clock):
+    c = TTLCache(maxsize=2, ttl=10)
+    c.set("a", 1)
+    c.set("b", 2)
+    c.get("a")
+    c.set("c", 3)
+    assert c.get("b") is None
+    assert c.get("a") == 1 and c.get("c") == 3
+    assert c.stats()["evictions"] == 1
+
+
+def test_evicts_to_stay_under_max_bytes(clock):
+    c = TTLCache(maxsize=10, ttl=10, max_bytes=20, sizeof=len)
+    c.set("a", "x" * 8)
+    c.set("b", "y" * 8)
+    c.set("c", "z" * 8)
+    assert len(c) == 2 and c.get("a") is None
+    c.set("huge", "w" * 21)
+    assert c.get("huge") is None and len(c) == 2
+
+
+def test_normalize_query():
+    assert normalize_query("  Latest  NEWS on the Economy ") == "economy"
+    assert normalize_query("the news") == "the news"
+    assert normalize_query(None) == ""
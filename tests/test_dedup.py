@@ -0,0 +1,49 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from dedup import merge_near_duplicates  # noqa: E402
+
+
+def _item(title, source, description="", url=""):
+    return {"title": title, "description": description, "url": url, "source": {"name": source}}
+
+
+def test_different_stories_with_similar_headlines_stay_apart():
+    pairs = [
+        ("Sensex rises 500 points as IT stocks rally", "Sensex falls 500 points as IT stocks slump"),
+        ("Apple launches iPhone 16", "Apple launches iPhone 15"),
+        ("Earthquake hits Japan, 5 dead", "Earthquake hits Turkey, 5 dead"),
+    ]
+    for first, second in pairs:
+        merged = merge_near_duplicates([_item(first, "GNews"), _item(second, "Google News")])
+        assert [m["title"] for m in merged] == [first, second]
+
+
+def test_different_stories_with_similar_descriptions_stay_apart():
+    merged = merge_near_duplicates([
+        _item("Sensex rises 500 points as IT stocks rally", "GNews",
+              "Benchmark indices closed higher on Tuesday led by gains in Infosys and TCS."),
+        _item("Sensex falls 500 points as IT stocks slump", "Google News",
+              "Benchmark indices closed lower on Tuesday dragged by losses in Infosys and TCS."),
+    ])
+    assert len(merged) == 2
+
+
+def test_rewritten_headlines_merge_with_attribution():
+    merged = merge_near_duplicates([
+        _item("Stocks rally as Fed holds interest rates steady", "GNews", url="https://a.example/1"),
+        _item("Stocks rally as Fed holds interest rates steady - Reuters", "Google News", url="https://b.example/2"),
+        _item("Stocks rally after Fed holds interest rates steady", "Reddit - r/worldnews", url="https://c.example/3"),
+    ])
+    assert len(merged) == 1
+    assert [s["name"] for s in merged[0]["sources"]] == ["GNews", "Google News", "Reddit - r/worldnews"]
+
+
+def test_same_canonical_url_merges_regardless_of_title():
+    merged = merge_near_duplicates([
+        _item("Totally different words here", "Reddit - r/worldnews", url="https://x.example/a?utm_source=rss"),
+        _item("Nothing alike at all really", "Hacker News", url="https://www.x.example/a/"),
+    ])
+    assert len(merged) == 1
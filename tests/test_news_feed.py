@@ -0,0 +1,55 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from news_feed import ArticleFeed, make_cursor, parse_cursor  # noqa: E402
+
+
+def _articles(*ids):
+    return [{"title": f"Story {i}", "url": f"https://x.example/{i}"} for i in ids]
+
+
+def _ids(articles):
+    return [a["url"].rsplit("/", 1)[1] for a in articles]
+
+
+def test_since_returns_only_newer_articles_newest_first():
+    feed = ArticleFeed()
+    # Lists arrive newest first
+    assert _ids(feed.add(_articles(2, 1))) == ["2", "1"]
+    articles, cursor = feed.since("")
+    assert _ids(articles) == ["2", "1"]
+
+    assert _ids(feed.add(_articles(4, 3, 2))) == ["4", "3"]
+    articles, cursor = feed.since(cursor)
+    assert _ids(articles) == ["4", "3"]
+
+    articles, again = feed.since(cursor)
+    assert articles == [] and again == cursor
+
+
+def test_cursor_starts_from_now():
+    feed = ArticleFeed()
+    feed.add(_articles(1))
+    cursor = feed.cursor()
+    assert feed.since(cursor)[0] == []
+    feed.add(_articles(2))
+    assert _ids(feed.since(cursor)[0]) == ["2"]
+
+
+def test_foreign_or_malformed_cursors_mean_everything():
+    feed = ArticleFeed()
+    feed.add(_articles(1))
+    for cursor in ("", None, "garbage", "0-5", make_cursor(0)):
+        assert parse_cursor(cursor) == 0
+        assert _ids(feed.since(cursor)[0]) == ["1"]
+
+
+def test_oldest_articles_drop_out_past_max_items():
+    feed = ArticleFeed(max_items=2)
+    feed.add(_articles(3, 2, 1))
+    assert len(feed) == 2
+    assert _ids(feed.since("")[0]) == ["3", "2"]
+    # A dropped article counts as new if it comes back
+    assert _ids(feed.add(_articles(1))) == ["1"]
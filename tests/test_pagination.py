@@ -0,0 +1,67 @@
+import os
+import sys
+from datetime import datetime, timedelta
+
+import mongomock
+from bson import ObjectId
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from pagination import decode_cursor, encode_cursor, keyset_page, parse_limit  # noqa: E402
+
+
+@pytest.fixture
+def chats():
+    collection = mongomock.MongoClient().db.chats
+    start = datetime(2026, 1, 1)
+    # Pairs share a timestamp so ordering has to fall back to _id
+    collection.insert_many([{"email": "a@b.c", "n": n, "timestamp": start + timedelta(minutes=n // 2)}
+                            for n in range(7)])
+    return collection
+
+
+def _numbers(docs):
+    return [doc["n"] for doc in docs]
+
+
+def test_cursor_round_trip():
+    doc = {"timestamp": datetime(2026, 1, 1, 12, 30), "_id": ObjectId()}
+    assert decode_cursor(encode_cursor(doc)) == (doc["timestamp"], doc["_id"])
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_parse_limit():
+    assert parse_limit(None) == 50
+    assert parse_limit("500") == 200
+    with pytest.raises(ValueError):
+        parse_limit("0")
+
+
+def test_first_page_is_newest_entries_in_ascending_order(chats):
+    docs, cursor = keyset_page(chats, {"email": "a@b.c"}, None, newest_first=False, limit=3)
+    assert _numbers(docs) == [4, 5, 6]
+
+    docs, cursor = keyset_page(chats, {"email": "a@b.c"}, None, newest_first=False, limit=3, before=cursor)
+    assert _numbers(docs) == [1, 2, 3]
+    docs, cursor = keyset_page(chats, {"email": "a@b.c"}, None, newest_first=False, limit=3, before=cursor)
+    assert _numbers(docs) == [0]
+    assert cursor is None
+
+
+def test_after_pages_forward(chats):
+    first, _ = keyset_page(chats, {"email": "a@b.c"}, None, newest_first=False, limit=7)
+    docs, cursor = keyset_page(chats, {"email": "a@b.c"}, None, newest_first=False, limit=2,
+                               after=encode_cursor(first[1]))
+    assert _numbers(docs) == [2, 3]
+    docs, cursor = keyset_page(chats, {"email": "a@b.c"}, None, newest_first=False, limit=2, after=cursor)
+    assert _numbers(docs) == [4, 5]
+
+
+def test_newest_first_pages(chats):
+    docs, cursor = keyset_page(chats, {"email": "a@b.c"}, None, newest_first=True, limit=4)
+    assert _numbers(docs) == [6, 5, 4, 3]
+    docs, cursor = keyset_page(chats, {"email": "a@b.c"}, None, newest_first=True, limit=4, before=cursor)
+    assert _numbers(docs) == [2, 1, 0]
+    assert cursor is None
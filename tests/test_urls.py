@@ -0,0 +1,42 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from urls import canonicalize_url, clean_url, unwrap_redirect, url_hash  # noqa: E402
+
+
+def test_clean_url_keeps_the_rest_of_the_query_verbatim():
+    url = "https://x.example/a?amp&id=1%2C2&utm_source=rss&q=a+b&fbclid=abc"
+    assert clean_url(url) == "https://x.example/a?amp&id=1%2C2&q=a+b"
+
+
+def test_clean_url_drops_an_all_tracking_query():
+    assert clean_url("https://x.example/a?utm_source=rss&UTM_Medium=email") == "https://x.example/a"
+
+
+def test_clean_url_leaves_non_http_values_alone():
+    assert clean_url("#") == "#"
+    assert clean_url("") == ""
+
+
+def test_unwrap_nested_redirects():
+    url = ("https://out.reddit.com/t3_x?url=https%3A%2F%2Fl.facebook.com%2Fl.php"
+           "%3Fu%3Dhttps%253A%252F%252Fsite.example%252Fs")
+    assert unwrap_redirect(url) == "https://site.example/s"
+
+
+def test_clean_url_unwraps_and_strips_the_target():
+    url = "https://www.google.com/url?q=https://site.example/story%3Fid%3D7%26utm_medium%3Demail&sa=D"
+    assert clean_url(url) == "https://site.example/story?id=7"
+
+
+def test_canonicalize_url():
+    assert canonicalize_url("http://WWW.X.example:80/a//b/?b=2&a=1#frag") == "https://x.example/a/b?a=1&b=2"
+    assert canonicalize_url("https://x.example:8443/a") == "https://x.example:8443/a"
+    assert canonicalize_url("https://x.example") == "https://x.example/"
+
+
+def test_url_hash_matches_variants_of_the_same_page():
+    assert url_hash("https://x.example/a/?utm_source=rss") == url_hash("http://www.x.example/a")
+    assert url_hash("https://x.example/a?id=1") != url_hash("https://x.example/a?id=2")
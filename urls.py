@@ -0,0 +1,117 @@
+import base64
+import binascii
+import hashlib
+import re
+from urllib.parse import parse_qsl, unquote_plus, urlencode, urlsplit, urlunsplit
+
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid",
+    "ref", "ref_src", "ref_url", "cmpid", "ocid", "smid", "smtyp", "taid", "ito", "oc",
+    "_ga", "_gl", "guccounter", "guce_referrer", "guce_referrer_sig", "spm", "share",
+}
+TRACKING_PREFIXES = ("utm_", "at_", "pk_", "mtm_")
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Aggregator redirect endpoints and the query parameter carrying the target
+REDIRECTS = {
+    ("google.com", "/url"): ("q", "url"),
+    ("l.facebook.com", "/l.php"): ("u",),
+    ("lm.facebook.com", "/l.php"): ("u",),
+    ("out.reddit.com", None): ("url",),
+    ("news.google.com", "/url"): ("url", "q"),
+}
+
+_URL_IN_BYTES = re.compile(rb"https?://[\x21-\x7e]+")
+
+
+def _host(netloc):
+    host = netloc.rpartition("@")[2].lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def _google_news_target(path):
+    """Publisher URL embedded in a Google News /articles/<id> link, if it can be decoded offline
+
+    Older ids are base64url protobufs with the URL as a length-prefixed field;
+    newer opaque ids need a round trip to Google and are left alone.
+    """
+    token = path.rstrip("/").rpartition("/")[2]
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+    except (binascii.Error, ValueError):
+        return None
+    start = raw.find(b"http")
+    if start < 1:
+        return None
+    # One- or two-byte varint length just before the URL
+    length = raw[start - 1]
+    if start >= 2 and raw[start - 2] & 0x80:
+        length = (raw[start - 2] & 0x7F) | (raw[start - 1] << 7)
+    candidate = raw[start:start + length]
+    match = _URL_IN_BYTES.match(candidate) or _URL_IN_BYTES.match(raw, start)
+    return match.group().decode("ascii") if match else None
+
+
+def unwrap_redirect(url, _depth=0):
+    """Follow known aggregator redirect links to their target without any network access"""
+    parts = urlsplit(url)
+    host = _host(parts.netloc)
+    target = None
+
+    if host == "news.google.com" and "/articles/" in parts.path:
+        target = _google_news_target(parts.path)
+    else:
+        for (redirect_host, path), params in REDIRECTS.items():
+            if host == redirect_host and (path is None or parts.path == path):
+                query = dict(parse_qsl(parts.query))
+                target = next((query[p] for p in params if query.get(p, "").startswith("http")), None)
+                break
+
+    # Redirects sometimes wrap redirects; a couple of levels is plenty
+    if target and _depth < 3:
+        return unwrap_redirect(target, _depth + 1)
+    return target or url
+
+
+def _is_tracking(param):
+    param = param.lower()
+    return param in TRACKING_PARAMS or param.startswith(TRACKING_PREFIXES)
+
+
+def clean_url(url):
+    """The URL to show and link to: redirects unwrapped, tracking parameters removed"""
+    if not url or not url.startswith(("http://", "https://")):
+        return url
+    parts = urlsplit(unwrap_redirect(url.strip()))
+    # Filter the raw pairs rather than re-encoding, so the rest of the query reaches the publisher as-is
+    pairs = [pair for pair in parts.query.split("&")
+             if pair and not _is_tracking(unquote_plus(pair.partition("=")[0]))]
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, "&".join(pairs), parts.fragment))
+
+
+def canonicalize_url(url):
+    """Identity form of an article URL, equal for every way sources link to the same page
+
+    On top of clean_url: https scheme, lower-case host without "www." or a
+    default port, no fragment or trailing slash, and sorted query parameters.
+    """
+    if not url or not url.startswith(("http://", "https://")):
+        return url or ""
+    parts = urlsplit(clean_url(url))
+    host = _host(parts.netloc)
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port and port != DEFAULT_PORTS.get(parts.scheme.lower()):
+        host = f"{host.rpartition(':')[0]}:{port}"
+    else:
+        host = host.rpartition(":")[0] if ":" in host else host
+    path = re.sub(r"/{2,}", "/", parts.path).rstrip("/") or "/"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit(("https", host, path, query, ""))
+
+
+def url_hash(url):
+    """Short stable key of a URL's canonical form, for hash indexes over articles"""
+    return hashlib.sha1(canonicalize_url(url).encode("utf-8")).hexdigest()[:16]
@@ -0,0 +1,139 @@
+import atexit
+import queue
+import threading
+import time
+from collections import Counter
+from pymongo.errors import BulkWriteError
+
+
+def _error_summary(e):
+    """Exception type and error codes with counts, never the message
+
+    Driver messages quote the failed documents (BulkWriteError's "op",
+    duplicate key values in errmsg), which hold users' emails and chats.
+    """
+    if isinstance(e, BulkWriteError):
+        codes = Counter(err.get("code") for err in e.details.get("writeErrors", []))
+        codes.update(err.get("code") for err in e.details.get("writeConcernErrors", []))
+        return "BulkWriteError: " + ", ".join(f"code {code} x{count}" for code, count in codes.items())
+    code = getattr(e, "code", None)
+    return f"{type(e).__name__} (code {code})" if code is not None else type(e).__name__
+
+
+class WriteBehindBuffer:
+    """Queue inserts for a collection and flush them in the background with insert_many
+
+    A batch is written once max_batch documents are queued or flush_interval
+    seconds after its first document, whichever comes first. The queue holds at
+    most max_pending documents; when it is full, add() waits put_timeout seconds
+    and then writes synchronously on the caller's thread, which pushes back on
+    writers instead of growing memory. Pending documents are flushed at exit.
+    """
+
+    def __init__(self, collection, max_batch=100, flush_interval=0.5, max_pending=10000, put_timeout=0.05):
+        self.collection = collection
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+        self.enqueued = 0
+        self.written = 0
+        self.failed = 0
+        self.batches = 0
+        self.sync_writes = 0
+        self.last_error = None
+        self._thread = threading.Thread(target=self._run, name=f"write-behind-{collection.name}", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def add(self, doc):
+        if not self._stopped.is_set():
+            try:
+                self._queue.put(doc, timeout=self.put_timeout)
+                with self._lock:
+                    self.enqueued += 1
+                return
+            except queue.Full:
+                pass
+        with self._lock:
+            self.sync_writes += 1
+        self._write([doc])
+
+    def _run(self):
+        while True:
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                if self._stopped.is_set():
+                    return
+                continue
+
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            self._write(batch)
+            for _ in batch:
+                self._queue.task_done()
+
+    def _apply(self, batch):
+        """Write one batch; returns how many documents were written"""
+        return len(self.collection.insert_many(batch, ordered=False).inserted_ids)
+
+    def _written_before_error(self, details):
+        return details.get("nInserted", 0)
+
+    def _write(self, batch):
+        try:
+            written, failed, error = self._apply(batch), 0, None
+        except BulkWriteError as e:
+            written = self._written_before_error(e.details)
+            failed, error = len(batch) - written, _error_summary(e)
+        except Exception as e:
+            # Driver, encoding or anything else: count the loss, keep the flusher thread alive
+            written, failed, error = 0, len(batch), _error_summary(e)
+
+        if error:
+            print(f"[ERROR] Write-behind flush to {self.collection.name} lost {failed} documents: {error}")
+        with self._lock:
+            self.batches += 1
+            self.written += written
+            self.failed += failed
+            if error:
+                self.last_error = error
+
+    def flush(self):
+        """Block until everything queued so far has been written"""
+        self._queue.join()
+
+    def close(self, timeout=5):
+        self._stopped.set()
+        self._thread.join(timeout)
+        leftovers = []
+        while True:
+            try:
+                leftovers.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        for start in range(0, len(leftovers), self.max_batch):
+            self._write(leftovers[start:start + self.max_batch])
+
+    def stats(self):
+        with self._lock:
+            return {
+                "pending": self._queue.qsize(),
+                "enqueued": self.enqueued,
+                "written": self.written,
+                "failed": self.failed,
+                "batches": self.batches,
+                "sync_writes": self.sync_writes,
+                "last_error": self.last_error,
+            }